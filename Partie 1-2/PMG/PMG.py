@@ -1,38 +1,74 @@
 #!/usr/bin/env python3
-import random
-import collections
-import math
-Point = collections.namedtuple("Point", "x y")
+"""
+Trace une image en niveaux de gris au format PGM : un fond blanc et deux
+disques aléatoires remplis de bruit, ou les formes décrites dans un fichier.
+
+L'image est rendue tuile par tuile, en parallèle, avec le module raster,
+puis écrite en un seul appel avec le module netpbm, en P5 (binaire, un
+octet par pixel) ou en P2 (texte) sur demande.
+"""
+import argparse
+import sys
+
+import numpy as np
+
+import netpbm
+import raster
+
+
+def formes_aleatoires(largeur, hauteur, alea):
+    """ Renvoie les deux disques remplis de bruit de l'image par défaut.
+
+    alea est un numpy.random.Generator. Les centres et rayons sont tirés
+    comme avant : un disque entier dans l'image, de rayon éventuellement nul.
+    """
+    formes = []
+    for _ in range(2):
+        x, y = int(alea.integers(largeur, endpoint=True)), int(alea.integers(hauteur, endpoint=True))
+        rayon = int(alea.integers(min(x, largeur - x, y, hauteur - y), endpoint=True))
+        formes.append(raster.Cercle(x, y, rayon, None))
+    return formes
+
 
 def main():
     """ Programme principal pour tracer l'image. """
+    analyseur = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    analyseur.add_argument("hauteur", type=int, nargs='?', help="demandée au clavier si absente")
+    analyseur.add_argument("largeur", type=int, nargs='?', help="demandée au clavier si absente")
+    analyseur.add_argument("--texte", action="store_true", help="écrit du P2 (texte) au lieu de P5 (binaire)")
+    analyseur.add_argument("--graine", type=int, help="graine pour une image reproductible")
+    analyseur.add_argument("--formes", type=argparse.FileType("r"),
+                           help="fichier de formes à tracer au lieu des deux disques (voir raster.lit_formes)")
+    analyseur.add_argument("--fond", type=int, default=255, help="niveau de gris du fond (défaut : 255)")
+    analyseur.add_argument("--taille-tuile", type=int, default=256, help="côté des tuiles en pixels (défaut : 256)")
+    analyseur.add_argument("--processus", type=int, help="nombre de processus (défaut : tous les cœurs)")
+    analyseur.add_argument("-o", "--sortie", default="image.PGM",
+                           help="fichier de sortie, - pour la sortie standard (défaut : image.PGM)")
+    arguments = analyseur.parse_args()
+    hauteur = arguments.hauteur
+    if hauteur is None:
+        hauteur = int(input("Quelle hauteur d'image voulez vous ? \n > "))
+    largeur = arguments.largeur
+    if largeur is None:
+        largeur = int(input("Quelle largeur d'image voulez vous ? \n > "))
+
+    alea = np.random.default_rng(arguments.graine)
+    if arguments.formes is None:
+        formes = formes_aleatoires(largeur, hauteur, alea)
+    else:
+        try:
+            formes = raster.lit_formes(arguments.formes)
+        except ValueError as erreur:
+            analyseur.error(f"{arguments.formes.name} : {erreur}")
+    # La graine du bruit vient du même générateur : une graine donne une image
+    graine_bruit = int(alea.integers(2**63))
+    pixels = raster.rend_formes(formes, largeur, hauteur, arguments.fond, arguments.taille_tuile,
+                                arguments.processus, graine_bruit)
+    if arguments.sortie == "-":
+        netpbm.ecrit_image(sys.stdout.buffer, pixels, arguments.texte)
+    else:
+        with open(arguments.sortie, "wb") as image:
+            netpbm.ecrit_image(image, pixels, arguments.texte)
 
-    def distance2(centre, x, y):
-        """ Calcul la distance d'un point, de coords x et y a un centre de cercle. """
-        return (x - centre.x)**2 + (y - centre.y)**2
-
-    # Les trois premieres lignes d'en-tete
-    image = open('image.PGM', 'w+')
-    image.write('P2\n')
-    hauteur = int(input("Quelle hauteur d'image voulez vous ? \n > "))
-    largeur = int(input("Quelle largeur d'image voulez vous ? \n > "))
-    image.write(f"{largeur} {hauteur}\n")
-    image.write('255\n')
-
-    # Les coordonnees et tailles de ces deux cercles, aléatoires
-    centre1 = Point(random.randint(0, largeur), random.randint(0, hauteur))
-    rayon1 = random.randint(0, min(centre1.x, largeur - centre1.x, centre1.y, hauteur - centre1.y))**2
-    centre2 = Point(random.randint(0, largeur), random.randint(0, hauteur))
-    rayon2 = random.randint(0, min(centre2.x, largeur - centre2.x, centre2.y, hauteur - centre2.y))**2
-
-    # Tracé de tous les pixels
-    for y in range(hauteur):
-        for x in range(largeur):
-            if distance2(centre1, x, y) > rayon1 and distance2(centre2, x, y) > rayon2:
-                image.write("255 ")
-            else:
-                image.write(str(random.randint(0,255)) + " ")
-        image.write("\n")
-    
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
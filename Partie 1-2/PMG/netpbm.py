@@ -0,0 +1,173 @@
+"""
+Lecture et écriture d'images netpbm : PGM (niveaux de gris, P2 texte ou P5
+binaire) et PPM (couleur, P3 texte ou P6 binaire).
+
+Les pixels sont des tableaux NumPy (hauteur, largeur) en niveaux de gris ou
+(hauteur, largeur, 3) en couleur, d'octets si la valeur maximale est au plus
+255, d'entiers 16 bits gros-boutistes sinon (comme dans le fichier).
+
+Les formats binaires ne sont jamais chargés : ouvre_image renvoie un
+numpy.memmap sur les pixels du fichier, et cree_image crée un fichier de la
+bonne taille dont on remplit les pixels, par exemple tuile par tuile avec
+remplit_par_tuiles, qui ne projette en mémoire qu'une bande à la fois. On
+peut ainsi traiter des images plus grandes que la mémoire. Les formats
+texte sont lus et écrits en entier en mémoire.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Nombre de canaux et caractère binaire de chaque format géré
+Format = namedtuple('Format', 'canaux binaire')
+FORMATS = {"P2": Format(1, False), "P5": Format(1, True), "P3": Format(3, False), "P6": Format(3, True)}
+
+# decalage est la position en octets du premier pixel dans le fichier
+Entete = namedtuple('Entete', 'format largeur hauteur maximum decalage')
+
+
+def lit_entete(fichier):
+    """ Lit l'en-tête d'un fichier netpbm ouvert en binaire et renvoie un Entete.
+
+    Le fichier est laissé positionné sur le premier pixel. Les commentaires
+    (de # à la fin de la ligne) sont ignorés. Lève ValueError si le fichier
+    n'est pas une image P2, P3, P5 ou P6 valide.
+    """
+    format_image = fichier.read(2).decode("ascii", "replace")
+    if format_image not in FORMATS:
+        raise ValueError(f"format netpbm non géré : {format_image!r}")
+    valeurs = []
+    octet = fichier.read(1)
+    while len(valeurs) < 3:
+        if octet == b"#":
+            fichier.readline()
+            octet = fichier.read(1)
+        elif octet.isspace():
+            octet = fichier.read(1)
+        elif octet.isdigit():
+            chiffres = b""
+            while octet.isdigit():
+                chiffres += octet
+                octet = fichier.read(1)
+            valeurs.append(int(chiffres))
+        elif not octet:
+            raise ValueError("en-tête netpbm incomplet")
+        else:
+            raise ValueError(f"caractère inattendu dans l'en-tête netpbm : {octet!r}")
+    # Un seul blanc sépare la valeur maximale des pixels, il vient d'être lu
+    if not octet.isspace():
+        raise ValueError("en-tête netpbm mal terminé")
+    largeur, hauteur, maximum = valeurs
+    if not 0 < maximum < 65536:
+        raise ValueError(f"valeur maximale invalide : {maximum}")
+    return Entete(format_image, largeur, hauteur, maximum, fichier.tell())
+
+
+def forme_pixels(entete):
+    """ Renvoie la forme du tableau des pixels décrits par l'en-tête. """
+    if FORMATS[entete.format].canaux == 1:
+        return (entete.hauteur, entete.largeur)
+    return (entete.hauteur, entete.largeur, 3)
+
+
+def type_pixels(maximum):
+    """ Renvoie le type NumPy des pixels pour une valeur maximale donnée. """
+    return np.dtype(np.uint8) if maximum < 256 else np.dtype(">u2")
+
+
+def ouvre_image(chemin, mode="r"):
+    """ Renvoie (entête, pixels) pour l'image netpbm du fichier chemin.
+
+    Pour P5 et P6, pixels est un numpy.memmap sur le fichier, ouvert en
+    lecture seule (mode "r"), en lecture et écriture ("r+") ou en copie à
+    l'écriture ("c") : rien n'est lu avant d'accéder aux pixels. Pour P2 et
+    P3, le fichier est lu et pixels est un tableau ordinaire.
+    """
+    with open(chemin, "rb") as fichier:
+        entete = lit_entete(fichier)
+        if not FORMATS[entete.format].binaire:
+            valeurs = np.array(fichier.read().split(), dtype=np.uint16)
+            nombre = int(np.prod(forme_pixels(entete)))
+            if len(valeurs) < nombre:
+                raise ValueError(f"{chemin} : {len(valeurs)} valeurs pour {nombre} attendues")
+            pixels = valeurs[:nombre].astype(type_pixels(entete.maximum)).reshape(forme_pixels(entete))
+            return entete, pixels
+    return entete, np.memmap(chemin, type_pixels(entete.maximum), mode, entete.decalage, forme_pixels(entete))
+
+
+def genere_entete(format_image, largeur, hauteur, maximum=255):
+    """ Renvoie les octets de l'en-tête d'une image netpbm. """
+    return f"{format_image}\n{largeur} {hauteur}\n{maximum}\n".encode()
+
+
+def cree_image(chemin, largeur, hauteur, couleur=False, maximum=255):
+    """ Crée un fichier P5 (ou P6 si couleur) de largeur x hauteur pixels et renvoie (entête, memmap).
+
+    Le fichier est agrandi à sa taille finale sans écrire les pixels (ils
+    valent 0) : seules les parties du memmap effectivement touchées
+    occupent de la mémoire. Pour remplir une très grande image, préférer
+    remplit_par_tuiles, qui libère chaque bande une fois écrite.
+    """
+    format_image = "P6" if couleur else "P5"
+    entete_octets = genere_entete(format_image, largeur, hauteur, maximum)
+    entete = Entete(format_image, largeur, hauteur, maximum, len(entete_octets))
+    taille = int(np.prod(forme_pixels(entete))) * type_pixels(maximum).itemsize
+    with open(chemin, "wb") as fichier:
+        fichier.write(entete_octets)
+        fichier.truncate(entete.decalage + taille)
+    return entete, np.memmap(chemin, type_pixels(maximum), "r+", entete.decalage, forme_pixels(entete))
+
+
+def tuiles(largeur, hauteur, taille_tuile):
+    """ Itère, ligne de tuiles par ligne de tuiles, sur les couples (tranche des lignes, tranche des colonnes). """
+    for debut_y in range(0, hauteur, taille_tuile):
+        for debut_x in range(0, largeur, taille_tuile):
+            yield (slice(debut_y, min(debut_y + taille_tuile, hauteur)),
+                   slice(debut_x, min(debut_x + taille_tuile, largeur)))
+
+
+def ouvre_bande(chemin, entete, debut, fin, mode="r+"):
+    """ Renvoie un numpy.memmap sur les lignes debut à fin (exclue) d'une image P5 ou P6. """
+    forme = forme_pixels(entete)
+    octets_par_ligne = int(np.prod(forme[1:])) * type_pixels(entete.maximum).itemsize
+    return np.memmap(chemin, type_pixels(entete.maximum), mode, entete.decalage + debut * octets_par_ligne,
+                     (fin - debut,) + forme[1:])
+
+
+def remplit_par_tuiles(chemin, entete, calcule_tuile, taille_tuile=1024):
+    """ Remplit tuile par tuile les pixels d'une image P5 ou P6, typiquement créée par cree_image.
+
+    calcule_tuile(lignes, colonnes) reçoit les tranches d'une tuile dans
+    l'image et renvoie son contenu (un tableau qui se diffuse à la forme de
+    la tuile). Chaque ligne de tuiles est projetée en mémoire à part, puis
+    vidée sur le disque et libérée : la mémoire utilisée est bornée par
+    une ligne de tuiles, quelle que soit la hauteur de l'image.
+    """
+    for debut_y in range(0, entete.hauteur, taille_tuile):
+        fin_y = min(debut_y + taille_tuile, entete.hauteur)
+        bande = ouvre_bande(chemin, entete, debut_y, fin_y)
+        for debut_x in range(0, entete.largeur, taille_tuile):
+            colonnes = slice(debut_x, min(debut_x + taille_tuile, entete.largeur))
+            bande[:, colonnes] = calcule_tuile(slice(debut_y, fin_y), colonnes)
+        bande.flush()
+        del bande
+
+
+def ecrit_image(fichier, pixels, texte=False, maximum=255):
+    """ Écrit le tableau pixels dans le fichier ouvert en binaire, en un seul appel.
+
+    Le format est P5 ou P6 selon la forme de pixels, ou P2 ou P3 avec texte :
+    chaque valeur est alors écrite sur une largeur fixe grâce à une table
+    des représentations texte, une ligne de texte par ligne de l'image.
+    """
+    couleur = pixels.ndim == 3
+    hauteur, largeur = pixels.shape[:2]
+    if not texte:
+        donnees = np.ascontiguousarray(pixels, dtype=type_pixels(maximum)).tobytes()
+        fichier.write(genere_entete("P6" if couleur else "P5", largeur, hauteur, maximum) + donnees)
+        return
+    chiffres = len(str(maximum))
+    table = np.array([list(f"{valeur:{chiffres}d} ".encode()) for valeur in range(maximum + 1)], dtype=np.uint8)
+    caracteres = table[np.asarray(pixels).reshape(hauteur, -1)]
+    caracteres[:, -1, -1] = ord("\n")
+    fichier.write(genere_entete("P3" if couleur else "P2", largeur, hauteur, maximum) + caracteres.tobytes())
@@ -0,0 +1,184 @@
+"""
+Rendu de formes (cercles, rectangles, polygones) dans une image en niveaux
+de gris, tuile par tuile.
+
+L'image est découpée en tuiles carrées rendues indépendamment, dans un
+ProcessPoolExecutor dont les processus écrivent directement dans un tableau
+en mémoire partagée. Pour chaque tuile, seules les formes dont la boîte
+englobante la touche sont examinées, et un rectangle qui couvre toute la
+tuile la remplit sans test par pixel. Les formes sont peintes dans l'ordre
+de la liste, chacune par dessus les précédentes.
+
+Un pixel (x, y) appartient à une forme si le point de coordonnées entières
+(x, y) est dedans. Le niveau d'une forme est un entier de 0 à 255, ou None
+pour un bruit aléatoire, tiré avec une graine qui ne dépend que de la
+graine de l'image et du numéro de la tuile : l'image ne dépend pas du
+nombre de processus.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from netpbm import tuiles
+
+Cercle = namedtuple('Cercle', 'x y rayon niveau')
+Rectangle = namedtuple('Rectangle', 'x y largeur hauteur niveau')
+# sommets est une séquence de couples (x, y), regle vaut "nonzero" ou "evenodd"
+# comme l'attribut fill-rule de SVG
+Polygone = namedtuple('Polygone', 'sommets niveau regle')
+
+REGLES = ("nonzero", "evenodd")
+
+
+def boite_englobante(forme):
+    """ Renvoie la boîte (x_min, y_min, x_max, y_max), bornes incluses, qui contient la forme. """
+    if isinstance(forme, Cercle):
+        return (forme.x - forme.rayon, forme.y - forme.rayon, forme.x + forme.rayon, forme.y + forme.rayon)
+    if isinstance(forme, Rectangle):
+        return (forme.x, forme.y, forme.x + forme.largeur, forme.y + forme.hauteur)
+    sommets = np.asarray(forme.sommets, dtype=float)
+    return tuple(sommets.min(axis=0)) + tuple(sommets.max(axis=0))
+
+
+def masque_forme(forme, lignes, colonnes):
+    """ Renvoie le masque booléen des pixels de la tuile (tranches lignes, colonnes) dans la forme. """
+    y = np.arange(lignes.start, lignes.stop)[:, None]
+    x = np.arange(colonnes.start, colonnes.stop)[None, :]
+    if isinstance(forme, Cercle):
+        return (x - forme.x)**2 + (y - forme.y)**2 <= forme.rayon**2
+    if isinstance(forme, Rectangle):
+        return (forme.x <= x) & (x < forme.x + forme.largeur) & (forme.y <= y) & (y < forme.y + forme.hauteur)
+
+    # Polygone : nombre d'enroulements autour de chaque pixel, arête par arête
+    sommets = np.asarray(forme.sommets, dtype=float)
+    enroulements = np.zeros((len(y), x.shape[1]), dtype=np.int32)
+    for (x0, y0), (x1, y1) in zip(sommets, np.roll(sommets, -1, axis=0)):
+        if y0 == y1:
+            continue
+        # > 0 si le pixel est à gauche de l'arête orientée
+        cote = (x1 - x0) * (y - y0) - (x - x0) * (y1 - y0)
+        if y0 < y1:
+            enroulements += ((y0 <= y) & (y < y1)) & (cote > 0)
+        else:
+            enroulements -= ((y1 <= y) & (y < y0)) & (cote < 0)
+    if forme.regle == "evenodd":
+        return enroulements % 2 != 0
+    return enroulements != 0
+
+
+def rend_tuile(pixels, formes, boites, lignes, colonnes, alea):
+    """ Peint dans pixels la tuile (tranches lignes, colonnes), boites étant le tableau (N, 4) des boîtes des formes. """
+    x_min, x_max = colonnes.start, colonnes.stop - 1
+    y_min, y_max = lignes.start, lignes.stop - 1
+    touchees = np.nonzero((boites[:, 0] <= x_max) & (boites[:, 2] >= x_min)
+                          & (boites[:, 1] <= y_max) & (boites[:, 3] >= y_min))[0]
+    tuile = pixels[lignes, colonnes]
+    for indice in touchees:
+        forme = formes[indice]
+        if isinstance(forme, Rectangle) and forme.x <= x_min and x_max < forme.x + forme.largeur \
+                and forme.y <= y_min and y_max < forme.y + forme.hauteur:
+            masque = np.ones(tuile.shape, dtype=bool)
+        else:
+            masque = masque_forme(forme, lignes, colonnes)
+        if forme.niveau is None:
+            tuile[masque] = alea.integers(0, 256, size=int(masque.sum()), dtype=np.uint8)
+        else:
+            tuile[masque] = forme.niveau
+
+
+# État de chaque processus de travail, rempli par _initialise
+_PARTAGE = {}
+
+
+def _initialise(nom_memoire, forme_image, formes, graine):
+    """ Rattache le processus de travail au tableau partagé et lui donne les formes. """
+    memoire = shared_memory.SharedMemory(name=nom_memoire)
+    _PARTAGE.update(memoire=memoire, pixels=np.ndarray(forme_image, dtype=np.uint8, buffer=memoire.buf),
+                    formes=formes, boites=_boites(formes), graine=graine)
+
+
+def _rend_tuile_partagee(tache):
+    """ Rend une tuile (numéro, lignes, colonnes) dans le tableau partagé du processus. """
+    numero, lignes, colonnes = tache
+    rend_tuile(_PARTAGE["pixels"], _PARTAGE["formes"], _PARTAGE["boites"], lignes, colonnes,
+               np.random.default_rng([_PARTAGE["graine"], numero]))
+
+
+def _boites(formes):
+    """ Renvoie le tableau (N, 4) des boîtes englobantes des formes. """
+    return np.array([boite_englobante(forme) for forme in formes], dtype=float).reshape(-1, 4)
+
+
+def rend_formes(formes, largeur, hauteur, fond=255, taille_tuile=256, processus=None, graine=0):
+    """ Renvoie l'image (hauteur, largeur) en uint8 des formes peintes sur un fond uniforme.
+
+    Les tuiles de taille_tuile pixels de côté sont réparties entre
+    processus processus de travail (tous les cœurs par défaut, 1 pour tout
+    faire dans ce processus), qui écrivent dans une mémoire partagée.
+    """
+    taches = [(numero, lignes, colonnes)
+              for numero, (lignes, colonnes) in enumerate(tuiles(largeur, hauteur, taille_tuile))]
+    if processus == 1:
+        pixels = np.full((hauteur, largeur), fond, dtype=np.uint8)
+        boites = _boites(formes)
+        for numero, lignes, colonnes in taches:
+            rend_tuile(pixels, formes, boites, lignes, colonnes, np.random.default_rng([graine, numero]))
+        return pixels
+
+    memoire = shared_memory.SharedMemory(create=True, size=max(1, largeur * hauteur))
+    try:
+        partage = np.ndarray((hauteur, largeur), dtype=np.uint8, buffer=memoire.buf)
+        partage.fill(fond)
+        with ProcessPoolExecutor(max_workers=processus, initializer=_initialise,
+                                 initargs=(memoire.name, (hauteur, largeur), formes, graine)) as executeur:
+            # list pour récupérer les éventuelles exceptions des processus
+            list(executeur.map(_rend_tuile_partagee, taches, chunksize=max(1, len(taches) // 64)))
+        pixels = partage.copy()
+        del partage
+    finally:
+        memoire.close()
+        memoire.unlink()
+    return pixels
+
+
+def lit_niveau(texte):
+    """ Convertit un niveau écrit dans un fichier de formes : un entier de 0 à 255, ou "bruit". """
+    if texte == "bruit":
+        return None
+    niveau = int(texte)
+    if not 0 <= niveau <= 255:
+        raise ValueError(f"niveau de gris hors de 0..255 : {niveau}")
+    return niveau
+
+
+def lit_formes(fichier):
+    """ Lit une liste de formes dans un fichier texte, une par ligne.
+
+    Les lignes vides et celles qui commencent par # sont ignorées. Syntaxe :
+        cercle X Y RAYON NIVEAU
+        rectangle X Y LARGEUR HAUTEUR NIVEAU
+        polygone NIVEAU REGLE X1 Y1 X2 Y2 X3 Y3 ...
+    où NIVEAU est un entier de 0 à 255 ou "bruit" et REGLE vaut nonzero ou
+    evenodd. Lève ValueError sur une ligne mal formée.
+    """
+    formes = []
+    for numero_ligne, ligne in enumerate(fichier, 1):
+        mots = ligne.split()
+        if not mots or mots[0].startswith("#"):
+            continue
+        try:
+            if mots[0] == "cercle" and len(mots) == 5:
+                formes.append(Cercle(*map(float, mots[1:4]), lit_niveau(mots[4])))
+            elif mots[0] == "rectangle" and len(mots) == 6:
+                formes.append(Rectangle(*map(float, mots[1:5]), lit_niveau(mots[5])))
+            elif mots[0] == "polygone" and len(mots) >= 9 and len(mots) % 2 == 1 and mots[2] in REGLES:
+                coordonnees = list(map(float, mots[3:]))
+                formes.append(Polygone(list(zip(coordonnees[::2], coordonnees[1::2])), lit_niveau(mots[1]), mots[2]))
+            else:
+                raise ValueError("forme inconnue ou mauvais nombre de valeurs")
+        except ValueError as erreur:
+            raise ValueError(f"ligne {numero_ligne} : {erreur}") from None
+    return formes
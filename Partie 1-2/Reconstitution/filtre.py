@@ -1,23 +1,280 @@
 #!/usr/bin/env python3
+"""
+Reconstitue une image à partir d'un fichier de points.
 
-#import sys
-import collections
-#sys.path.append("/Users/mathis/Desktop/TP_BPI/SVG") # Import file different folder
+Le fichier contient les coordonnées x et y des points, alternées et
+séparées par des blancs (en pratique une par ligne, comme p1.txt), ou un
+tableau NumPy (N, 2) enregistré en .npy. Il est lu par lots de taille fixe
+qui traversent une chaîne de générateurs : lecture, filtres optionnels
+(boîte, décimation, rejet des points aberrants), puis marquage des pixels
+occupés dans un masque de l'image. La mémoire utilisée ne dépend donc que
+de la taille des lots et de l'image, pas du nombre de points. Les points
+qui tombent dans le même pixel ne sont tracés qu'une fois, sous forme de
+carrés d'un pixel regroupés par TAILLE_CHEMIN en éléments path, ou d'image
+PGM. L'image n'est écrite qu'une fois tous les points lus, à partir du
+masque et dans l'ordre des lignes : elle ne dépend pas de la taille des
+lots.
+
+Avec --densite, les points sont comptés par case d'une grille (voir
+grille_points) et l'image est une carte de densité : un carré par case
+occupée, d'autant plus sombre qu'elle contient de points, au lieu de
+points dessinés les uns sur les autres. Avec --plus-proche, les points
+gardés sont aussi conservés puis indexés par une GrillePoints, pour afficher
+celui qui est le plus proche d'une position donnée.
+"""
+
+import argparse
+from contextlib import nullcontext
+import os
+import sys
+import time
+
+# svg et netpbm sont dans les dossiers voisins SVG et PMG
+DOSSIER_PARTIE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(DOSSIER_PARTIE, "SVG"))
+sys.path.append(os.path.join(DOSSIER_PARTIE, "PMG"))
+
+import numpy as np
+
+import netpbm
 import svg
-Point = collections.namedtuple('Point', 'x y')
+from grille_points import GrillePoints, compte_par_case
+
+FORMATS = ("svg", "pgm")
+
+# Nombre de carrés par élément path en SVG
+TAILLE_CHEMIN = 4096
+
+
+def lit_lots(entree, taille_lot=1 << 17):
+    """ Itère sur les points du fichier entree ("-" pour l'entrée standard) par tableaux (N, 2) d'au plus taille_lot.
+
+    Un fichier texte est lu par paquets de lignes, un fichier .npy par
+    paquets de valeurs après son en-tête. Lève ValueError si le nombre de
+    coordonnées est impair ou si une valeur n'est pas un nombre.
+    """
+    if entree.endswith(".npy"):
+        with open(entree, "rb") as fichier:
+            if np.lib.format.read_magic(fichier) == (1, 0):
+                _, fortran, type_valeurs = np.lib.format.read_array_header_1_0(fichier)
+            else:
+                _, fortran, type_valeurs = np.lib.format.read_array_header_2_0(fichier)
+            if fortran:
+                raise ValueError(f"{entree} : tableau en ordre Fortran, attendu (N, 2) en ordre C")
+            while True:
+                valeurs = np.fromfile(fichier, type_valeurs, 2 * taille_lot)
+                if not len(valeurs):
+                    break
+                yield valeurs.astype(float).reshape(-1, 2)
+        return
+
+    with nullcontext(sys.stdin.buffer) if entree == "-" else open(entree, "rb") as fichier:
+        reste = np.empty(0)
+        while True:
+            # Environ 4 octets par coordonnée dans les fichiers de points
+            lignes = fichier.readlines(8 * taille_lot)
+            if not lignes:
+                break
+            valeurs = np.concatenate((reste, np.array(b"".join(lignes).split(), dtype=float)))
+            coupure = len(valeurs) - len(valeurs) % 2
+            reste = valeurs[coupure:]
+            yield valeurs[:coupure].reshape(-1, 2)
+        if len(reste):
+            raise ValueError(f"{entree} : nombre impair de coordonnées")
+
+
+def compte(lots, compteurs, cle):
+    """ Laisse passer les lots en ajoutant leur nombre de points à compteurs[cle]. """
+    for lot in lots:
+        compteurs[cle] += len(lot)
+        yield lot
+
+
+def collecte(lots, reservoir):
+    """ Laisse passer les lots en les ajoutant à la liste reservoir. """
+    for lot in lots:
+        reservoir.append(lot)
+        yield lot
+
+
+def garde_dans_boite(lots, boite):
+    """ Ne garde que les points dans la boîte (x_min, y_min, x_max, y_max), bornes incluses. """
+    x_min, y_min, x_max, y_max = boite
+    for lot in lots:
+        yield lot[(lot[:, 0] >= x_min) & (lot[:, 0] <= x_max) & (lot[:, 1] >= y_min) & (lot[:, 1] <= y_max)]
+
+
+def decime(lots, pas):
+    """ Ne garde qu'un point sur pas, en comptant à travers les lots. """
+    decalage = 0
+    for lot in lots:
+        yield lot[(-decalage) % pas::pas]
+        decalage = (decalage + len(lot)) % pas
+
+
+def rejette_aberrants(lots, seuil):
+    """ Rejette les points à plus de seuil écarts-types de la moyenne, sur x ou sur y.
+
+    La moyenne et la variance sont celles de tous les points vus jusque-là,
+    lot courant compris, mises à jour lot par lot (formule de Chan) : les
+    premiers lots sont donc jugés sur moins de points que les suivants.
+    """
+    nombre, moyenne, m2 = 0, np.zeros(2), np.zeros(2)
+    for lot in lots:
+        if not len(lot):
+            yield lot
+            continue
+        moyenne_lot = lot.mean(axis=0)
+        ecart = moyenne_lot - moyenne
+        total = nombre + len(lot)
+        m2 += ((lot - moyenne_lot)**2).sum(axis=0) + ecart**2 * nombre * len(lot) / total
+        moyenne += ecart * len(lot) / total
+        nombre = total
+        ecart_type = np.sqrt(m2 / nombre)
+        yield lot[(np.abs(lot - moyenne) <= seuil * ecart_type).all(axis=1)]
+
+
+def marque_pixels(lots, occupes):
+    """ Marque dans occupes, masque booléen (hauteur, largeur), les pixels qui contiennent un point des lots.
+
+    Un point (x, y) est dans le pixel (floor(x), floor(y)), les points hors
+    de l'image sont ignorés.
+    """
+    hauteur, largeur = occupes.shape
+    deja_vus = occupes.reshape(-1)
+    for lot in lots:
+        pixels = np.floor(lot).astype(np.int64)
+        dedans = (pixels[:, 0] >= 0) & (pixels[:, 0] < largeur) & (pixels[:, 1] >= 0) & (pixels[:, 1] < hauteur)
+        deja_vus[pixels[dedans, 1] * largeur + pixels[dedans, 0]] = True
+
+
+def cases_occupees(occupes, taille_chemin=TAILLE_CHEMIN):
+    """ Itère sur les tableaux (K, 2) d'au plus taille_chemin pixels (x, y) occupés, dans l'ordre des lignes. """
+    largeur = occupes.shape[1]
+    indices = np.flatnonzero(occupes)
+    for debut in range(0, len(indices), taille_chemin):
+        morceau = indices[debut:debut + taille_chemin]
+        yield np.column_stack((morceau % largeur, morceau // largeur))
+
+
+def ecrit_svg(ecrivain, lots_pixels, taille=1, couleur="black"):
+    """ Trace un carré de taille pixels par case (x, y), un élément path par lot non vide.
+
+    Les cases sont en unités de taille pixels. Chaque carré est placé par
+    un déplacement relatif depuis le précédent, ce qui garde les nombres
+    courts (les cases d'un lot sont dans l'ordre des lignes).
+    """
+    carre = f"h{taille}v{taille}h-{taille}z"
+    for lot in lots_pixels:
+        if not len(lot):
+            continue
+        lot = lot * taille
+        ecarts = np.diff(lot, axis=0)
+        donnees = f"M%d %d{carre}" % tuple(lot[0]) + (f"m%d %d{carre}" * len(ecarts)) % tuple(ecarts.ravel().tolist())
+        ecrivain.write(svg.genere_chemin(donnees, couleur))
+
+
+def niveaux_densite(comptes, nombre_niveaux=256):
+    """ Renvoie les niveaux de gris (uint8) d'une carte de densité : blanc sans point, noir au maximum.
+
+    L'échelle est logarithmique, pour que les cases peu peuplées restent
+    visibles à côté des plus denses, et quantifiée en nombre_niveaux niveaux.
+    """
+    maximum = max(int(comptes.max()), 1) if comptes.size else 1
+    densites = np.log1p(comptes) / np.log1p(maximum)
+    pas = np.ceil(densites * (nombre_niveaux - 1)) / (nombre_niveaux - 1)
+    return np.round(255 * (1 - pas)).astype(np.uint8)
+
+
+def ecrit_densite_svg(ecrivain, niveaux, taille_case):
+    """ Trace une carte de densité avec un seul élément path par niveau de gris présent (hors blanc). """
+    for niveau in np.unique(niveaux):
+        if niveau == 255:
+            continue
+        lignes, colonnes = np.nonzero(niveaux == niveau)
+        ecrit_svg(ecrivain, [np.column_stack((colonnes, lignes))], taille_case, f"rgb({niveau},{niveau},{niveau})")
+
 
 def main():
-    print(svg.genere_balise_debut_image(640,480))
-    print(svg.genere_balise_debut_groupe("black", 'black', 1))
+    """ Lit les points et écrit l'image reconstituée, puis affiche le débit sur la sortie d'erreur. """
+    analyseur = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    analyseur.add_argument("entree", nargs='?', default="-",
+                           help="fichier de points, texte ou .npy (défaut : entrée standard)")
+    analyseur.add_argument("--largeur", type=int, default=640, help="largeur de l'image (défaut : 640)")
+    analyseur.add_argument("--hauteur", type=int, default=480, help="hauteur de l'image (défaut : 480)")
+    analyseur.add_argument("--format", choices=FORMATS, default="svg")
+    analyseur.add_argument("--texte", action="store_true", help="avec --format pgm, écrit du P2 au lieu de P5")
+    analyseur.add_argument("--taille-lot", type=int, default=1 << 17,
+                           help="nombre de points lus à la fois (défaut : 131072)")
+    analyseur.add_argument("--boite", type=float, nargs=4, metavar=("X_MIN", "Y_MIN", "X_MAX", "Y_MAX"),
+                           help="ne garde que les points dans cette boîte")
+    analyseur.add_argument("--decimation", type=int, metavar="PAS", help="ne garde qu'un point sur PAS")
+    analyseur.add_argument("--aberrants", type=float, metavar="SEUIL",
+                           help="rejette les points à plus de SEUIL écarts-types de la moyenne")
+    analyseur.add_argument("--densite", action="store_true", help="trace une carte de densité des points")
+    analyseur.add_argument("--taille-case", type=int, default=1,
+                           help="côté en pixels des cases de la carte de densité (défaut : 1)")
+    analyseur.add_argument("--niveaux", type=int, default=16,
+                           help="nombre de niveaux de gris de la carte de densité en SVG (défaut : 16)")
+    analyseur.add_argument("--plus-proche", type=float, nargs=2, metavar=("X", "Y"),
+                           help="affiche le point gardé le plus proche de (X, Y) (garde tous les points en mémoire)")
+    svg.ajoute_options_sortie(analyseur)
+    arguments = analyseur.parse_args()
+    if min(arguments.taille_lot, arguments.taille_case, arguments.decimation or 1) < 1 or arguments.niveaux < 2:
+        analyseur.error("--taille-lot, --taille-case et --decimation doivent être au moins 1, --niveaux au moins 2")
 
-    for x in range(1000):
-        x = input()
-        y = input()
-        point = Point(x,y)
-        print(svg.genere_cercle(point, 1))
+    compteurs = {"lus": 0, "gardes": 0}
+    lots = compte(lit_lots(arguments.entree, arguments.taille_lot), compteurs, "lus")
+    if arguments.boite is not None:
+        lots = garde_dans_boite(lots, arguments.boite)
+    if arguments.decimation is not None:
+        lots = decime(lots, arguments.decimation)
+    if arguments.aberrants is not None:
+        lots = rejette_aberrants(lots, arguments.aberrants)
+    lots = compte(lots, compteurs, "gardes")
+    gardes = []
+    if arguments.plus_proche is not None:
+        lots = collecte(lots, gardes)
+    occupes = np.zeros((arguments.hauteur, arguments.largeur), dtype=bool)
 
-    print(svg.genere_balise_fin_groupe())
-    print(svg.genere_balise_fin_image())
+    debut = time.perf_counter()
+    try:
+        with svg.ouvre_sortie(arguments.sortie, arguments.compression) as sortie:
+            if arguments.densite:
+                comptes = compte_par_case(lots, arguments.largeur, arguments.hauteur, arguments.taille_case)
+                occupes = comptes > 0
+                if arguments.format == "pgm":
+                    niveaux = niveaux_densite(comptes)
+                    pixels = np.repeat(np.repeat(niveaux, arguments.taille_case, axis=0), arguments.taille_case, axis=1)
+                    sortie.flush()
+                    netpbm.ecrit_image(sortie.buffer, pixels[:arguments.hauteur, :arguments.largeur], arguments.texte)
+                else:
+                    with svg.SvgWriter(sortie, arguments.largeur, arguments.hauteur) as ecrivain:
+                        ecrit_densite_svg(ecrivain, niveaux_densite(comptes, arguments.niveaux), arguments.taille_case)
+                print(f"{int(comptes.sum() - occupes.sum())} points superposés, jusqu'à {int(comptes.max(initial=0))}"
+                      " par case", file=sys.stderr)
+            else:
+                marque_pixels(lots, occupes)
+                if arguments.format == "pgm":
+                    sortie.flush()
+                    netpbm.ecrit_image(sortie.buffer, np.where(occupes, 0, 255).astype(np.uint8), arguments.texte)
+                else:
+                    with svg.SvgWriter(sortie, arguments.largeur, arguments.hauteur) as ecrivain:
+                        ecrit_svg(ecrivain, cases_occupees(occupes))
+    except (OSError, ValueError) as erreur:
+        analyseur.error(str(erreur))
+    duree = time.perf_counter() - debut
+    print(f"{compteurs['lus']} points lus, {compteurs['gardes']} gardés, {int(occupes.sum())} cases occupées, "
+          f"{duree:.2f} s ({compteurs['lus'] / max(duree, 1e-9):.0f} points/s)", file=sys.stderr)
+    if arguments.plus_proche is not None:
+        points = np.concatenate(gardes) if gardes else np.empty((0, 2))
+        resultat = GrillePoints(points).plus_proche(*arguments.plus_proche)
+        if resultat is None:
+            print("aucun point gardé", file=sys.stderr)
+        else:
+            indice, distance_point = resultat
+            print(f"point gardé le plus proche : n°{indice} ({points[indice, 0]:g}, {points[indice, 1]:g}), "
+                  f"à {distance_point:g}", file=sys.stderr)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,168 @@
+"""
+Index spatial à grille uniforme pour des nuages de points.
+
+Le plan est découpé en cases carrées de taille_case de côté, numérotées
+ligne * colonnes + colonne comme les cases des labyrinthes. Le comptage des
+points par case se fait d'un coup avec numpy.bincount, éventuellement lot
+par lot (compte_par_case), ce qui suffit pour les cartes de densité. Pour
+les requêtes de voisinage, GrillePoints trie les points par numéro de case
+et ne garde que les cases occupées, avec la position de leur premier point
+(stockage « CSR » creux) : les points d'une case sont alors une simple
+tranche d'un tableau, et la mémoire ne dépend que du nombre de points, pas
+de l'étendue de la grille.
+"""
+
+import numpy as np
+
+
+def compte_par_case(lots, largeur, hauteur, taille_case=1):
+    """ Renvoie le tableau (lignes, colonnes) du nombre de points par case d'une image largeur x hauteur.
+
+    lots est un itérable de tableaux (N, 2) de points, consommés un par un :
+    la mémoire utilisée ne dépend que de la taille des lots et de la grille.
+    Les points hors de l'image sont ignorés.
+    """
+    colonnes, lignes = -(-largeur // taille_case), -(-hauteur // taille_case)
+    comptes = np.zeros(lignes * colonnes, dtype=np.int64)
+    for lot in lots:
+        lot = lot[(lot[:, 0] >= 0) & (lot[:, 0] < largeur) & (lot[:, 1] >= 0) & (lot[:, 1] < hauteur)]
+        cases = np.floor(lot / taille_case).astype(np.int64)
+        comptes += np.bincount(cases[:, 1] * colonnes + cases[:, 0], minlength=len(comptes))
+    return comptes.reshape(lignes, colonnes)
+
+
+def taille_case_auto(points):
+    """ Renvoie une taille de case qui donne de l'ordre d'une case par point sur la boîte englobante. """
+    if len(points) < 2:
+        return 1.0
+    largeur, hauteur = (points.max(axis=0) - points.min(axis=0)).tolist()
+    # la seconde borne garde peu de cases quand les points sont presque alignés
+    taille = max(np.sqrt(largeur * hauteur / len(points)), max(largeur, hauteur) / len(points))
+    return taille if taille > 0 else 1.0
+
+
+class GrillePoints:
+    """
+    Index d'un tableau (N, 2) de points sur une grille uniforme couvrant
+    leur boîte englobante.
+
+    Sans taille_case, elle est choisie par taille_case_auto pour avoir de
+    l'ordre de N cases. Construction en O(N log N) (un tri), nombre de
+    points d'une case en O(log N) (recherche dichotomique parmi les cases
+    occupées), points d'une case en O(log N) plus leur nombre, et recherche
+    du plus proche voisin en parcourant des anneaux de cases de plus en plus
+    grands autour de la requête.
+    """
+
+    def __init__(self, points, taille_case=None):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.taille_case = taille_case_auto(points) if taille_case is None else taille_case
+        self.origine = points.min(axis=0) if len(points) else np.zeros(2)
+        etendue = points.max(axis=0) - self.origine if len(points) else np.zeros(2)
+        self.colonnes, self.lignes = (np.floor(etendue / self.taille_case).astype(np.int64) + 1).tolist()
+        if self.colonnes * self.lignes >= 2**63:
+            raise ValueError(f"taille_case {self.taille_case} trop petite pour l'étendue des points")
+
+        cases = self._cases(points)
+        numeros = cases[:, 1] * self.colonnes + cases[:, 0]
+        # indices d'origine des points, triés par case
+        self.indices = np.argsort(numeros, kind="stable")
+        self.points = points[self.indices]
+        # numéros des cases occupées, croissants, et nombre de points de chacune
+        self.numeros, self.comptes = np.unique(numeros, return_counts=True)
+        self.debuts = np.concatenate(([0], np.cumsum(self.comptes)))
+
+    def _cases(self, points):
+        """ Renvoie les cases (colonne, ligne) d'un tableau (N, 2) de points, éventuellement hors de la grille. """
+        return np.floor((points - self.origine) / self.taille_case).astype(np.int64)
+
+    def _rang(self, colonne, ligne):
+        """ Renvoie le rang de la case (colonne, ligne) parmi les cases occupées, ou None si elle est vide. """
+        if not (0 <= colonne < self.colonnes and 0 <= ligne < self.lignes):
+            return None
+        numero = ligne * self.colonnes + colonne
+        rang = int(np.searchsorted(self.numeros, numero))
+        if rang < len(self.numeros) and self.numeros[rang] == numero:
+            return rang
+        return None
+
+    def case(self, x, y):
+        """ Renvoie la case (colonne, ligne) qui contient le point (x, y), éventuellement hors de la grille. """
+        colonne, ligne = self._cases(np.array([[x, y]], dtype=float))[0].tolist()
+        return colonne, ligne
+
+    def compte(self, x, y):
+        """ Renvoie le nombre de points dans la case qui contient (x, y). """
+        rang = self._rang(*self.case(x, y))
+        return 0 if rang is None else int(self.comptes[rang])
+
+    def points_case(self, colonne, ligne):
+        """ Renvoie (indices d'origine, tableau (K, 2)) des points de la case (colonne, ligne). """
+        rang = self._rang(colonne, ligne)
+        if rang is None:
+            return self.indices[:0], self.points[:0]
+        tranche = slice(self.debuts[rang], self.debuts[rang + 1])
+        return self.indices[tranche], self.points[tranche]
+
+    def cases_multiples(self, seuil=2):
+        """ Renvoie le tableau (K, 3) des (colonne, ligne, nombre) des cases d'au moins seuil points. """
+        gardees = self.comptes >= seuil
+        numeros = self.numeros[gardees]
+        return np.column_stack((numeros % self.colonnes, numeros // self.colonnes, self.comptes[gardees]))
+
+    def _anneau(self, colonne, ligne, rayon):
+        """ Renvoie les tableaux (colonnes, lignes) des cases de la grille à distance de Tchebychev rayon de (colonne, ligne).
+
+        Seule la partie de l'anneau qui tombe dans la grille est listée,
+        même quand (colonne, ligne) est loin en dehors.
+        """
+        if rayon == 0:
+            if 0 <= colonne < self.colonnes and 0 <= ligne < self.lignes:
+                return np.array([colonne]), np.array([ligne])
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        morceaux_colonnes, morceaux_lignes = [], []
+        colonnes_cotes = np.arange(max(colonne - rayon, 0), min(colonne + rayon, self.colonnes - 1) + 1)
+        for case_ligne in (ligne - rayon, ligne + rayon):
+            if 0 <= case_ligne < self.lignes:
+                morceaux_colonnes.append(colonnes_cotes)
+                morceaux_lignes.append(np.full(len(colonnes_cotes), case_ligne))
+        lignes_cotes = np.arange(max(ligne - rayon + 1, 0), min(ligne + rayon - 1, self.lignes - 1) + 1)
+        for case_colonne in (colonne - rayon, colonne + rayon):
+            if 0 <= case_colonne < self.colonnes:
+                morceaux_colonnes.append(np.full(len(lignes_cotes), case_colonne))
+                morceaux_lignes.append(lignes_cotes)
+        if not morceaux_colonnes:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(morceaux_colonnes), np.concatenate(morceaux_lignes)
+
+    def plus_proche(self, x, y):
+        """ Renvoie (indice d'origine, distance) du point le plus proche de (x, y), ou None sans points.
+
+        Les anneaux de cases sont parcourus du plus proche au plus lointain,
+        en commençant au premier qui touche la grille, et la recherche
+        s'arrête dès qu'aucune case de l'anneau suivant ne peut contenir de
+        point plus proche que le meilleur trouvé. Les cases occupées d'un
+        anneau sont trouvées d'un coup par recherche dichotomique.
+        """
+        if not len(self.points):
+            return None
+        colonne, ligne = self.case(x, y)
+        # les anneaux plus petits que la distance de la case à la grille sont vides
+        rayon_min = max(0, -colonne, colonne - self.colonnes + 1, -ligne, ligne - self.lignes + 1)
+        rayon_max = max(abs(colonne), abs(colonne - self.colonnes + 1), abs(ligne), abs(ligne - self.lignes + 1))
+        meilleur, distance_meilleure = None, np.inf
+        for rayon in range(rayon_min, rayon_max + 1):
+            # un point à rayon cases de celle de la requête en est au moins à (rayon - 1) cases de distance
+            if (rayon - 1) * self.taille_case > distance_meilleure:
+                break
+            colonnes, lignes = self._anneau(colonne, ligne, rayon)
+            numeros = lignes * self.colonnes + colonnes
+            rangs = np.minimum(np.searchsorted(self.numeros, numeros), len(self.numeros) - 1)
+            for rang in rangs[self.numeros[rangs] == numeros].tolist():
+                indices = self.indices[self.debuts[rang]:self.debuts[rang + 1]]
+                points = self.points[self.debuts[rang]:self.debuts[rang + 1]]
+                distances = np.hypot(points[:, 0] - x, points[:, 1] - y)
+                plus_proche = int(np.argmin(distances))
+                if distances[plus_proche] < distance_meilleure:
+                    meilleur, distance_meilleure = int(indices[plus_proche]), float(distances[plus_proche])
+        return meilleur, distance_meilleure
@@ -0,0 +1,62 @@
+"""
+Tracé compact de plateaux de jeu en grille avec le module svg.
+
+Une case n'est décrite qu'une fois, dans une zone de définitions, puis
+chaque case du plateau est une simple référence use vers elle. Un damier
+complet n'est même qu'un seul rectangle rempli par un motif de 2 x 2 cases.
+Les positions sont des tableaux NumPy (N, 2) d'indices (colonne, ligne),
+convertis en pixels et formatés par lots : le travail par case est constant
+et très petit, quelle que soit la taille du plateau.
+"""
+
+import numpy as np
+import svg
+
+
+def ecrit_cases(ecrivain, cases, taille_case, couleur_ligne="black", epaisseur_ligne=2, identifiant="case"):
+    """
+    Trace le contour d'une case de taille_case pixels à chaque position
+    (colonne, ligne) du tableau cases, avec une seule définition de case.
+    """
+    ecrivain.debut_definitions()
+    ecrivain.debut_groupe_id(identifiant)
+    ecrivain.debut_groupe(couleur_ligne, "none", epaisseur_ligne)
+    ecrivain.rectangle(svg.Point(0, 0), taille_case, taille_case)
+    ecrivain.fin_groupe()
+    ecrivain.fin_groupe()
+    ecrivain.fin_definitions()
+    ecrivain.utilisations_tableau(identifiant, np.asarray(cases) * taille_case, precision=0)
+
+
+def ecrit_numeros(ecrivain, cases, numeros, taille_case, couleur="red"):
+    """
+    Écrit dans chaque case (colonne, ligne) du tableau cases le numéro
+    correspondant, vers le bas à gauche de la case.
+    """
+    decalage = np.array([taille_case / 4, taille_case * 7 / 8])
+    ecrivain.debut_groupe("none", couleur, 0)
+    ecrivain.textes_tableau(np.asarray(cases) * taille_case + decalage, numeros, precision=0)
+    ecrivain.fin_groupe()
+
+
+def ecrit_damier(ecrivain, colonnes, lignes, taille_case, couleur_foncee="black", couleur_claire="white",
+                 identifiant="damier"):
+    """
+    Trace un damier de colonnes x lignes cases de taille_case pixels, la
+    case en haut à gauche étant foncée, avec un seul rectangle rempli par un
+    motif de 2 x 2 cases.
+    """
+    ecrivain.debut_definitions()
+    ecrivain.debut_motif(identifiant, 2 * taille_case, 2 * taille_case)
+    ecrivain.debut_groupe("none", couleur_claire, 0)
+    ecrivain.rectangle(svg.Point(0, 0), 2 * taille_case, 2 * taille_case)
+    ecrivain.fin_groupe()
+    ecrivain.debut_groupe("none", couleur_foncee, 0)
+    ecrivain.rectangle(svg.Point(0, 0), taille_case, taille_case)
+    ecrivain.rectangle(svg.Point(taille_case, taille_case), taille_case, taille_case)
+    ecrivain.fin_groupe()
+    ecrivain.fin_motif()
+    ecrivain.fin_definitions()
+    ecrivain.debut_groupe("none", f"url(#{identifiant})", 0)
+    ecrivain.rectangle(svg.Point(0, 0), colonnes * taille_case, lignes * taille_case)
+    ecrivain.fin_groupe()
@@ -8,6 +8,13 @@ structure SVG pour obtenir une image valide.
 """
 
 from collections import namedtuple
+from contextlib import contextmanager
+from itertools import islice
+import argparse
+import gzip
+import io
+import sys
+import numpy as np
 
 # Definition de la structure Point composée de deux attributs x et y
 Point = namedtuple('Point', 'x y')
@@ -22,7 +29,8 @@ def genere_balise_debut_image(largeur, hauteur):
     bas.
     """
     
-    return f"<svg xmlns='http://www.w3.org/2000/svg' version='1.1' width='{largeur}' height='{hauteur}'>\n"
+    return f"<svg xmlns='http://www.w3.org/2000/svg' xmlns:xlink='http://www.w3.org/1999/xlink' " \
+        f"version='1.1' width='{largeur}' height='{hauteur}'>\n"
 
 def genere_balise_fin_image():
     """
@@ -59,6 +67,61 @@ def genere_balise_fin_groupe():
     
     return "</g>\n"
 
+def genere_balise_debut_groupe_id(identifiant):
+    """
+    Retourne la chaine de caractères correspondant à une balise ouvrante de
+    groupe nommé identifiant, pour pouvoir le réutiliser avec genere_utilisation.
+    Il se referme comme les autres groupes.
+    """
+
+    return f"<g id='{identifiant}'>\n"
+
+def genere_balise_debut_definitions():
+    """
+    Retourne la chaine de caractères correspondant à la balise ouvrante d'une
+    zone de définitions : les éléments qu'elle contient ne sont pas affichés,
+    seulement leurs utilisations.
+    """
+
+    return "<defs>\n"
+
+def genere_balise_fin_definitions():
+    """
+    Retourne la chaine de caractères correspondant à la balise fermante d'une
+    zone de définitions.
+    """
+
+    return "</defs>\n"
+
+def genere_utilisation(identifiant, transformation=None):
+    """
+    Retourne la chaine de caractères correspondant à un élément SVG use, qui
+    affiche une copie de l'élément identifiant, éventuellement transformée
+    (transformation est une chaîne comme "rotate(45 400 300)"). L'attribut
+    est xlink:href, le seul que comprennent les lecteurs SVG 1.1.
+    """
+
+    if transformation is None:
+        return f"<use xlink:href='#{identifiant}'/>\n"
+    return f"<use xlink:href='#{identifiant}' transform='{transformation}'/>\n"
+
+def genere_balise_debut_motif(identifiant, largeur, hauteur):
+    """
+    Retourne la chaine de caractères correspondant à la balise ouvrante d'un
+    motif (pattern) nommé identifiant, de largeur x hauteur pixels, qui se
+    répète pour remplir les éléments dont le remplissage vaut
+    "url(#identifiant)". Il se place dans une zone de définitions.
+    """
+
+    return f"<pattern id='{identifiant}' width='{largeur}' height='{hauteur}' patternUnits='userSpaceOnUse'>\n"
+
+def genere_balise_fin_motif():
+    """
+    Retourne la chaine de caractères correspondant à la balise fermante d'un motif.
+    """
+
+    return "</pattern>\n"
+
 def genere_cercle(centre, rayon):
     """
     Retourne la chaine de caractères correspondant à un élément SVG représentant
@@ -85,10 +148,84 @@ def genere_polygone(points, couleur):
     points est un tableaux de points.
     """
 
-    chaine = ''
-    for point in points:
-        chaine = chaine + str(point.x) + ',' + str(point.y) + ' '
-    return f'<polygon points="{chaine}", style="fill:{couleur}"/>\n'
+    chaine = ' '.join(f"{point.x},{point.y}" for point in points)
+    return f'<polygon points="{chaine}" style="fill:{couleur}"/>\n'
+
+def genere_segments(coordonnees, precision=2):
+    """
+    Version par lot de genere_segment.
+
+    coordonnees est un tableau NumPy (N, 4) dont chaque ligne vaut
+    x1, y1, x2, y2. Retourne la chaine de caractères des N segments, formatés
+    en une seule passe avec precision chiffres après la virgule.
+    """
+    coordonnees = np.asarray(coordonnees, dtype=float).reshape(-1, 4)
+    nombre = f"%.{precision}f"
+    modele = f"<line x1='{nombre}' y1='{nombre}' x2='{nombre}' y2='{nombre}'/>\n"
+    return (modele * len(coordonnees)) % tuple(coordonnees.ravel().tolist())
+
+def genere_cercles(centres, rayons, precision=2):
+    """
+    Version par lot de genere_cercle.
+
+    centres est un tableau NumPy (N, 2), rayons un nombre ou un tableau de N
+    rayons.
+    """
+    centres = np.asarray(centres, dtype=float).reshape(-1, 2)
+    rayons = np.broadcast_to(np.asarray(rayons, dtype=float), (len(centres),))
+    valeurs = np.column_stack((centres, rayons))
+    nombre = f"%.{precision}f"
+    modele = f"<circle cx='{nombre}' cy='{nombre}' r='{nombre}'/>\n"
+    return (modele * len(valeurs)) % tuple(valeurs.ravel().tolist())
+
+def genere_polygones(points, couleurs, precision=2):
+    """
+    Version par lot de genere_polygone.
+
+    points est un tableau NumPy (N, K, 2) décrivant N polygones de K sommets,
+    couleurs est une couleur commune ou une séquence de N couleurs.
+    """
+    points = np.asarray(points, dtype=float)
+    nb_polygones, nb_sommets = points.shape[0], points.shape[1]
+    if nb_polygones == 0:
+        return ""
+    if isinstance(couleurs, str):
+        couleurs = [couleurs] * nb_polygones
+    valeurs = np.empty((nb_polygones, 2 * nb_sommets + 1), dtype=object)
+    valeurs[:, :-1] = points.reshape(nb_polygones, -1).tolist()
+    valeurs[:, -1] = couleurs
+    nombre = f"%.{precision}f"
+    sommets = ' '.join([f"{nombre},{nombre}"] * nb_sommets)
+    modele = f'<polygon points="{sommets}" style="fill:%s"/>\n'
+    return (modele * nb_polygones) % tuple(valeurs.ravel().tolist())
+
+def genere_utilisations(identifiant, positions, precision=2):
+    """
+    Version par lot de genere_utilisation.
+
+    positions est un tableau NumPy (N, 2) : chaque ligne donne le décalage
+    x, y d'une copie de l'élément identifiant.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    nombre = f"%.{precision}f"
+    modele = f"<use xlink:href='#{identifiant}' x='{nombre}' y='{nombre}'/>\n"
+    return (modele * len(positions)) % tuple(positions.ravel().tolist())
+
+def genere_textes(positions, textes, precision=2):
+    """
+    Retourne la chaine de caractères de N éléments SVG text.
+
+    positions est un tableau NumPy (N, 2) des points d'ancrage, textes une
+    séquence de N valeurs affichées telles quelles (elles ne doivent pas
+    contenir de caractères spéciaux XML).
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    valeurs = np.empty((len(positions), 3), dtype=object)
+    valeurs[:, :2] = positions.tolist()
+    valeurs[:, 2] = list(textes)
+    nombre = f"%.{precision}f"
+    modele = f"<text x='{nombre}' y='{nombre}'>%s</text>\n"
+    return (modele * len(valeurs)) % tuple(valeurs.ravel().tolist())
 
 def genere_balise_debut_groupe_transp(niveau_opacite):
     """
@@ -117,4 +254,378 @@ def genere_rectangle(top_left, width, height):
     """
     Retourne la chaine de caractères correspondant à un élément SVG représentant un rectangle.
     """
-    return f"<rect x='{top_left.x}' y='{top_left.y}' width='{width}' height='{height}'> \n"
+    return f"<rect x='{top_left.x}' y='{top_left.y}' width='{width}' height='{height}'/>\n"
+
+def genere_polyligne(points, precision=2):
+    """
+    Retourne la chaine de caractères correspondant à un élément SVG polyline,
+    non rempli, reliant dans l'ordre les points (couples x, y) donnés.
+    """
+    sommets = " ".join(f"{formate_nombre(x, precision)},{formate_nombre(y, precision)}" for x, y in points)
+    return f"<polyline fill='none' points='{sommets}'/>\n"
+
+def genere_chemin(donnees, remplissage="none"):
+    """
+    Retourne la chaine de caractères correspondant à un élément SVG path, non
+    rempli par défaut, dont l'attribut d est la chaîne donnees.
+    """
+    return f"<path fill='{remplissage}' d='{donnees}'/>\n"
+
+def formate_nombre(valeur, precision=2):
+    """
+    Formate un nombre avec au plus precision chiffres après la virgule, sans
+    zéros inutiles (5.0 donne "5", 2.50 donne "2.5").
+    """
+    chaine = f"{valeur:.{precision}f}"
+    if '.' in chaine:
+        chaine = chaine.rstrip('0').rstrip('.')
+    return "0" if chaine == "-0" else chaine
+
+
+@contextmanager
+def ouvre_sortie(destination="-", niveau_compression=None):
+    """
+    Gestionnaire de contexte qui fournit un flux texte où écrire une image SVG.
+
+    destination peut être :
+    -- un nom de fichier, compressé avec gzip si son extension est .svgz ;
+    -- "-" pour la sortie standard ;
+    -- un flux binaire déjà ouvert (tube, socket, BytesIO...), qui n'est pas
+        fermé à la sortie du contexte.
+
+    Si niveau_compression (de 0 à 9) est donné, la sortie est compressée avec
+    gzip à ce niveau quelle que soit la destination.
+    """
+    compresse = niveau_compression is not None \
+        or (isinstance(destination, str) and destination.endswith('.svgz'))
+    niveau = NIVEAU_COMPRESSION_DEFAUT if niveau_compression is None else niveau_compression
+
+    if isinstance(destination, str) and destination != "-":
+        if compresse:
+            fichier = gzip.open(destination, 'wt', compresslevel=niveau, encoding='utf-8')
+        else:
+            fichier = open(destination, 'w', encoding='utf-8')
+        with fichier:
+            yield fichier
+        return
+
+    if destination == "-":
+        sys.stdout.flush()
+        flux = sys.stdout.buffer
+    else:
+        flux = destination
+    flux_binaire = gzip.GzipFile(fileobj=flux, mode='wb', compresslevel=niveau) if compresse else flux
+    texte = io.TextIOWrapper(flux_binaire, encoding='utf-8')
+    try:
+        yield texte
+    finally:
+        texte.flush()
+        texte.detach()
+        if compresse:
+            flux_binaire.close()
+        flux.flush()
+
+def nom_compresse(nom):
+    """ Renvoie le nom du fichier nom une fois compressé avec gzip : .svgz pour un .svg, .gz ajouté sinon. """
+    return nom + "z" if nom.endswith(".svg") else nom + ".gz"
+
+
+class _ActionCompression(argparse.Action):
+    """ Action de -z et --niveau : range le niveau, et compresse aussi le nom de sortie s'il vaut encore sa valeur par défaut. """
+
+    def __init__(self, *args, sortie_defaut="-", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sortie_defaut = sortie_defaut
+
+    def __call__(self, analyseur, espace, valeur, option=None):
+        if self.nargs != 0:
+            setattr(espace, self.dest, valeur)
+        elif getattr(espace, self.dest) is None:
+            # -z ne remplace pas un niveau déjà donné par --niveau
+            setattr(espace, self.dest, self.const)
+        if espace.sortie == self.sortie_defaut != "-":
+            espace.sortie = nom_compresse(self.sortie_defaut)
+
+
+def ajoute_options_sortie(analyseur, sortie_defaut="-"):
+    """
+    Ajoute à un argparse.ArgumentParser les options communes de sortie des
+    générateurs d'images : -o/--sortie, -z/--compression et --niveau.
+    Les valeurs de sortie et compression sont à passer telles quelles à
+    ouvre_sortie. Avec -z ou --niveau, un fichier de sortie par défaut est
+    renommé par nom_compresse.
+    """
+    analyseur.add_argument("-o", "--sortie", default=sortie_defaut,
+                           help="fichier de sortie, .svgz pour compresser, - pour la sortie standard "
+                                f"(défaut : {sortie_defaut}, ou sa version compressée avec -z)")
+    analyseur.add_argument("-z", "--compression", nargs=0, const=NIVEAU_COMPRESSION_DEFAUT,
+                           action=_ActionCompression, sortie_defaut=sortie_defaut,
+                           help=f"compresse la sortie avec gzip (niveau {NIVEAU_COMPRESSION_DEFAUT})")
+    analyseur.add_argument("--niveau", dest="compression", type=int, choices=range(10), metavar="NIVEAU",
+                           action=_ActionCompression, sortie_defaut=sortie_defaut,
+                           help="compresse la sortie avec gzip au niveau donné, de 0 à 9 (implique -z)")
+
+# Bon compromis entre taille et vitesse pour du texte SVG
+NIVEAU_COMPRESSION_DEFAUT = 6
+
+
+class SvgWriter:
+    """
+    Écrivain SVG bufferisé, à utiliser à la place d'un print par élément.
+
+    Les éléments sont formatés par lots dans un tampon en mémoire de taille
+    bornée, qui est vidé dans le fichier par gros morceaux. Utilisé comme
+    gestionnaire de contexte, il écrit la balise ouvrante de l'image à
+    l'entrée, puis referme les groupes encore ouverts et la balise svg à la
+    sortie. Le fichier lui-même n'est pas fermé : il appartient à l'appelant.
+
+    Un SvgWriter possède aussi une méthode write, on peut donc lui passer des
+    chaînes déjà formatées avec print(..., file=writer).
+
+    En mode_chemin, les segments consécutifs ne sont pas écrits sous forme de
+    balises line mais regroupés dans un seul élément path en coordonnées
+    relatives, les segments alignés qui se prolongent étant fusionnés. Le
+    chemin est terminé à la fin du groupe, avant tout autre élément, ou tous
+    les taille_lot segments.
+    """
+
+    def __init__(self, fichier, largeur, hauteur, taille_tampon=1 << 16, taille_lot=4096,
+                 mode_chemin=False, precision=2):
+        self.fichier = fichier
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.taille_tampon = taille_tampon
+        self.taille_lot = taille_lot
+        self.tampon = []
+        self.taille = 0
+        self.groupes_ouverts = 0
+        self.mode_chemin = mode_chemin
+        self.precision = precision
+        self.chemin = []
+        self.position = (0, 0)
+        self.en_attente = None
+
+    def __enter__(self):
+        self.write(genere_balise_debut_image(self.largeur, self.hauteur))
+        return self
+
+    def __exit__(self, *_):
+        self.ferme()
+
+    def write(self, chaine):
+        """ Ajoute une chaîne au tampon, qui est vidé s'il devient trop gros. """
+        if self.en_attente is not None:
+            self._termine_chemin()
+        self.tampon.append(chaine)
+        self.taille += len(chaine)
+        if self.taille >= self.taille_tampon:
+            self.vide()
+
+    def vide(self):
+        """ Écrit le contenu du tampon, et le chemin en cours, dans le fichier en un seul appel. """
+        if self.en_attente is not None:
+            self._termine_chemin()
+        if self.tampon:
+            self.fichier.write("".join(self.tampon))
+            self.tampon = []
+            self.taille = 0
+
+    def ferme(self):
+        """ Referme les groupes ouverts et l'image, puis vide le tampon. """
+        while self.groupes_ouverts:
+            self.fin_groupe()
+        self.write(genere_balise_fin_image())
+        self.vide()
+
+    def debut_groupe(self, couleur_ligne, couleur_remplissage, epaisseur_ligne):
+        """ Ouvre un groupe d'éléments avec un style particulier. """
+        self.write(genere_balise_debut_groupe(couleur_ligne, couleur_remplissage, epaisseur_ligne))
+        self.groupes_ouverts += 1
+
+    def debut_groupe_transp(self, niveau_opacite):
+        """ Ouvre un groupe d'éléments partiellement transparent. """
+        self.write(genere_balise_debut_groupe_transp(niveau_opacite))
+        self.groupes_ouverts += 1
+
+    def debut_groupe_id(self, identifiant):
+        """ Ouvre un groupe nommé identifiant, réutilisable avec utilise. """
+        self.write(genere_balise_debut_groupe_id(identifiant))
+        self.groupes_ouverts += 1
+
+    def debut_definitions(self):
+        """ Ouvre une zone de définitions, à refermer avec fin_definitions. """
+        self.write(genere_balise_debut_definitions())
+
+    def fin_definitions(self):
+        """ Referme la zone de définitions. """
+        self.write(genere_balise_fin_definitions())
+
+    def utilise(self, identifiant, transformation=None):
+        """ Ajoute une copie, éventuellement transformée, de l'élément identifiant. """
+        self.write(genere_utilisation(identifiant, transformation))
+
+    def debut_motif(self, identifiant, largeur, hauteur):
+        """ Ouvre un motif répétable, à refermer avec fin_motif. """
+        self.write(genere_balise_debut_motif(identifiant, largeur, hauteur))
+
+    def fin_motif(self):
+        """ Referme le motif. """
+        self.write(genere_balise_fin_motif())
+
+    def fin_groupe(self):
+        """ Referme le dernier groupe ouvert. """
+        self.write(genere_balise_fin_groupe())
+        self.groupes_ouverts -= 1
+
+    def _ecrit_par_lots(self, elements, formate):
+        """ Formate les éléments par lots de taille_lot et les ajoute au tampon. """
+        elements = iter(elements)
+        lot = list(islice(elements, self.taille_lot))
+        while lot:
+            self.write("".join(map(formate, lot)))
+            lot = list(islice(elements, self.taille_lot))
+
+    def _ajoute_au_chemin(self, x_dep, y_dep, x_arr, y_arr):
+        """ Ajoute un segment au chemin en cours, en prolongeant si possible le précédent. """
+        if x_dep == x_arr and y_dep == y_arr:
+            return
+        if self.en_attente is not None:
+            x_0, y_0, x_1, y_1 = self.en_attente
+            if x_dep == x_1 and y_dep == y_1 \
+                    and (x_1 - x_0)*(y_arr - y_dep) == (y_1 - y_0)*(x_arr - x_dep) \
+                    and (x_1 - x_0)*(x_arr - x_dep) + (y_1 - y_0)*(y_arr - y_dep) > 0:
+                self.en_attente = (x_0, y_0, x_arr, y_arr)
+                return
+            self._pousse_segment()
+        self.en_attente = (x_dep, y_dep, x_arr, y_arr)
+
+    def _pousse_segment(self):
+        """ Traduit le segment en attente en commandes relatives du chemin. """
+        x_0, y_0, x_1, y_1 = self.en_attente
+        self.en_attente = None
+        nombre = lambda valeur: formate_nombre(valeur, self.precision)
+        # position est celle du crayon telle que l'écrivent les écarts
+        # arrondis, pour que les erreurs d'arrondi ne s'accumulent pas
+        x, y = self.position
+        ecart_x, ecart_y = nombre(x_0 - x), nombre(y_0 - y)
+        # un chemin doit commencer par un déplacement
+        if not self.chemin or (ecart_x, ecart_y) != ("0", "0"):
+            self.chemin.append(f"m{ecart_x} {ecart_y}")
+            x, y = x + float(ecart_x), y + float(ecart_y)
+        ecart_x, ecart_y = nombre(x_1 - x), nombre(y_1 - y)
+        if y_1 == y_0:
+            self.chemin.append(f"h{ecart_x}")
+            self.position = (x + float(ecart_x), y)
+        elif x_1 == x_0:
+            self.chemin.append(f"v{ecart_y}")
+            self.position = (x, y + float(ecart_y))
+        else:
+            self.chemin.append(f"l{ecart_x} {ecart_y}")
+            self.position = (x + float(ecart_x), y + float(ecart_y))
+        if len(self.chemin) >= self.taille_lot:
+            self._ecrit_chemin()
+
+    def _ecrit_chemin(self):
+        """ Écrit le chemin accumulé sous forme d'un seul élément path. """
+        if self.chemin:
+            donnees = "".join(self.chemin)
+            self.chemin = []
+            self.position = (0, 0)
+            self.write(genere_chemin(donnees))
+
+    def _termine_chemin(self):
+        """ Pousse le segment en attente puis écrit le chemin en cours. """
+        self._pousse_segment()
+        self._ecrit_chemin()
+
+    def segment(self, dep, arr):
+        """ Ajoute un segment reliant les points dep et arr. """
+        if self.mode_chemin:
+            self._ajoute_au_chemin(dep.x, dep.y, arr.x, arr.y)
+        else:
+            self.write(genere_segment(dep, arr))
+
+    def taille_segment(self, dep, arr):
+        """ Estime le nombre de caractères qu'ajoutera segment(dep, arr), selon le mode d'écriture.
+
+        En mode_chemin, c'est la longueur des commandes relatives (un
+        déplacement si dep ne prolonge pas le chemin, puis un tracé) ; les
+        segments alignés fusionnés coûtent en fait un peu moins.
+        """
+        if not self.mode_chemin:
+            return len(genere_segment(dep, arr))
+        nombre = lambda valeur: formate_nombre(valeur, self.precision)
+        fin = self.position if self.en_attente is None else self.en_attente[2:]
+        taille = 0
+        if (dep.x, dep.y) != fin or (not self.chemin and self.en_attente is None):
+            taille += len(f"m{nombre(dep.x - fin[0])} {nombre(dep.y - fin[1])}")
+        return taille + len(f"l{nombre(arr.x - dep.x)} {nombre(arr.y - dep.y)}")
+
+    def segments(self, paires):
+        """ Ajoute les segments décrits par un itérable de couples de Point. """
+        if self.mode_chemin:
+            for dep, arr in paires:
+                self._ajoute_au_chemin(dep.x, dep.y, arr.x, arr.y)
+        else:
+            self._ecrit_par_lots(paires, lambda paire: genere_segment(*paire))
+
+    def segments_coordonnees(self, coordonnees):
+        """ Ajoute les segments décrits par un itérable de (x1, y1, x2, y2). """
+        if self.mode_chemin:
+            for x_dep, y_dep, x_arr, y_arr in coordonnees:
+                self._ajoute_au_chemin(x_dep, y_dep, x_arr, y_arr)
+        else:
+            self._ecrit_par_lots(coordonnees, lambda c: f"<line x1='{c[0]}' y1='{c[1]}' x2='{c[2]}' y2='{c[3]}'/>\n")
+
+    def cercles(self, centres, rayon):
+        """ Ajoute un cercle de rayon donné pour chaque Point de centres. """
+        self._ecrit_par_lots(centres, lambda centre: genere_cercle(centre, rayon))
+
+    def rectangle(self, top_left, width, height):
+        """ Ajoute un rectangle. """
+        self.write(genere_rectangle(top_left, width, height))
+
+    def polyligne(self, points):
+        """ Ajoute une ligne brisée reliant les points (couples x, y) donnés. """
+        self.write(genere_polyligne(points, self.precision))
+
+    def polygones(self, polygones, couleur):
+        """ Ajoute un polygone de la couleur donnée pour chaque tableau de points. """
+        self._ecrit_par_lots(polygones, lambda points: genere_polygone(points, couleur))
+
+    def _ecrit_tableau(self, tableau, genere, *arguments):
+        """ Découpe le tableau en lots de taille_lot lignes et les formate avec genere. """
+        for debut in range(0, len(tableau), self.taille_lot):
+            lot_arguments = [argument[debut:debut + self.taille_lot] if isinstance(argument, np.ndarray) else argument
+                             for argument in arguments]
+            self.write(genere(tableau[debut:debut + self.taille_lot], *lot_arguments))
+
+    def segments_tableau(self, coordonnees, precision=2):
+        """ Ajoute les segments d'un tableau NumPy (N, 4), voir genere_segments. """
+        if self.mode_chemin:
+            self.segments_coordonnees(np.asarray(coordonnees, dtype=float).reshape(-1, 4).tolist())
+            return
+        self._ecrit_tableau(np.asarray(coordonnees, dtype=float).reshape(-1, 4), genere_segments, precision)
+
+    def cercles_tableau(self, centres, rayons, precision=2):
+        """ Ajoute les cercles d'un tableau NumPy (N, 2), voir genere_cercles. """
+        centres = np.asarray(centres, dtype=float).reshape(-1, 2)
+        if not np.isscalar(rayons):
+            rayons = np.asarray(rayons, dtype=float)
+        self._ecrit_tableau(centres, genere_cercles, rayons, precision)
+
+    def polygones_tableau(self, points, couleurs, precision=2):
+        """ Ajoute les polygones d'un tableau NumPy (N, K, 2), voir genere_polygones. """
+        if not isinstance(couleurs, str):
+            couleurs = np.asarray(couleurs, dtype=object)
+        self._ecrit_tableau(np.asarray(points, dtype=float), genere_polygones, couleurs, precision)
+
+    def utilisations_tableau(self, identifiant, positions, precision=2):
+        """ Ajoute une copie de l'élément identifiant par ligne d'un tableau NumPy (N, 2), voir genere_utilisations. """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self._ecrit_tableau(positions, lambda lot: genere_utilisations(identifiant, lot, precision))
+
+    def textes_tableau(self, positions, textes, precision=2):
+        """ Ajoute les textes d'un tableau NumPy (N, 2) de positions, voir genere_textes. """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self._ecrit_tableau(positions, genere_textes, np.asarray(textes, dtype=object), precision)
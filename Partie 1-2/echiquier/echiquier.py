@@ -1,37 +1,36 @@
 #!/usr/bin/env python3
 
+import argparse
+
+import plateau
 import svg
-import sys
-from collections import namedtuple
-Point = namedtuple("Point", "x, y")
-
-def affichage():
-    """Programme qui va gerer l'affichage sur la sortie standard"""
-    print(svg.genere_balise_debut_image(800, 800))
-    for x in range(0, 800, 100):
-        for y in range(0, 800, 100):
-            if ((x+y)/100)%2 == 0:
-                print(svg.genere_balise_debut_groupe(None, 'Black', 0))
-            else:
-                print(svg.genere_balise_debut_groupe(None, 'White', 0))
-            print(svg.genere_rectangle(Point(x, y), 100, 100))
-            print(svg.genere_balise_fin_groupe())
-    print(svg.genere_balise_debut_groupe('Red', None, 10))
-    print(svg.genere_rectangle(Point(1,1), 798, 798))
-    print(svg.genere_balise_fin_groupe())
-    print(svg.genere_balise_fin_image())
+
+def affichage(image, nombre_cases=8, taille_case=100):
+    """Programme qui va gerer l'affichage de l'echiquier dans image.
+
+    Le damier est un seul rectangle rempli par un motif de 2 x 2 cases (voir
+    le module plateau), quel que soit le nombre de cases.
+    """
+    cote = nombre_cases * taille_case
+    with svg.SvgWriter(image, cote, cote) as ecrivain:
+        plateau.ecrit_damier(ecrivain, nombre_cases, nombre_cases, taille_case, 'Black', 'White')
+        ecrivain.debut_groupe('Red', 'none', 10)
+        ecrivain.rectangle(svg.Point(1, 1), cote - 2, cote - 2)
+        ecrivain.fin_groupe()
 
 
 def main():
     """
     Programme principal qui va gerer l'affichage de l'echiquier.
     """
-    
-    # if len(sys.argv) != 2 or sys.argv[1] == "-h" or sys.argv[1] == "--help":
-    #     print("utilisation:", sys.argv[0], " > image.svg")
-    #     sys.exit(1)
+    analyseur = argparse.ArgumentParser(description="Génère un échiquier en SVG.")
+    analyseur.add_argument("--cases", type=int, default=8, help="nombre de cases par côté (défaut : 8)")
+    analyseur.add_argument("--taille-case", type=int, default=100, help="côté d'une case en pixels (défaut : 100)")
+    svg.ajoute_options_sortie(analyseur)
+    arguments = analyseur.parse_args()
 
-    affichage()
+    with svg.ouvre_sortie(arguments.sortie, arguments.compression) as image:
+        affichage(image, arguments.cases, arguments.taille_case)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
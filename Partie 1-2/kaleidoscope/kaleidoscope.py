@@ -3,56 +3,114 @@
 
 Exercice graphique, quelques boucles, deux modules à écrire.
 """
+import argparse
 import sys
-from math import pi
 
 sys.path.append('C:\\Users\mathi\OneDrive\Documents\TP_BPI\SVG')
 
-import dessin
+import numpy as np
+
 import svg
 import triangle 
 
-def genere_image(nombre_triangles):
+class GenerateurTriangles:
+    """Générateur reproductible de triangles colorés aléatoires.
+
+    Tous les tirages viennent d'un seul numpy.random.Generator initialisé
+    avec graine : les coordonnées de tout un lot sont tirées en un appel,
+    les couleurs sont des indices dans une palette de taille_palette
+    chaînes "rgb(...)" tirées et internées une fois pour toutes. La même
+    graine donne donc la même image. Les triangles sont dans le quart en
+    bas à droite d'une image largeur x hauteur, à coordonnées entières
+    comme avec triangle.triangle_aleatoire.
+    """
+
+    def __init__(self, graine=None, largeur=800.0, hauteur=600.0, taille_palette=256):
+        self.alea = np.random.default_rng(graine)
+        self.minimums = np.array([int(largeur / 2), int(hauteur / 2)])
+        self.maximums = np.array([int(largeur), int(hauteur)])
+        composantes = self.alea.integers(0, 255, size=(taille_palette, 3)).tolist()
+        self.palette = np.array([sys.intern(f"rgb({rouge}, {vert}, {bleu})") for rouge, vert, bleu in composantes],
+                                dtype=object)
+
+    def lot(self, taille):
+        """Renvoie (tableau (taille, 3, 2) des triangles, tableau des taille couleurs)."""
+        triangles = self.alea.integers(self.minimums, self.maximums, size=(taille, 3, 2), endpoint=True)
+        couleurs = self.palette[self.alea.integers(len(self.palette), size=taille)]
+        return triangles.astype(float), couleurs
+
+    def lots(self, nombre_triangles, taille_lot=4096):
+        """Itère sur les lots d'au plus taille_lot triangles, nombre_triangles en tout."""
+        for debut in range(0, nombre_triangles, taille_lot):
+            yield self.lot(min(taille_lot, nombre_triangles - debut))
+
+
+def genere_image(nombre_triangles, image, taille_lot=4096, symetrie=8, instances=False, graine=None,
+                 taille_palette=256):
     """Génère le nombre de triangles demandé aleatoirement, les tourne.
 
-    Affiche le SVG correspondant sur la sortie standard.
+    Ecrit le SVG correspondant dans le fichier texte image, avec symetrie
+    copies tournées de chaque triangle. Les triangles sont traités par lots
+    de taille_lot : chaque lot est un tableau (N, 3, 2) tourné d'un coup par
+    les matrices de rotation, calculées une seule fois, puis écrit en un
+    seul appel à polygones_tableau, sans jamais garder toute l'image en
+    mémoire. Les triangles et leurs couleurs viennent d'un
+    GenerateurTriangles : la même graine donne la même image.
+
+    Avec instances, les triangles ne sont écrits qu'une fois, dans un groupe
+    de définitions, et l'image est faite de symetrie éléments use qui le
+    tournent : le fichier est environ symetrie fois plus petit, mais les
+    copies sont empilées rotation par rotation et non plus triangle par
+    triangle.
     """
 
     transparence = 0.6
     largeur, hauteur = 800.0, 600.0
-    print(svg.genere_balise_debut_image(largeur, hauteur))
-    print(svg.genere_balise_debut_groupe_transp(transparence))
-    
-    centre = svg.Point(largeur / 2, hauteur / 2)
-
-    for _ in range(nombre_triangles):
-        # on génère un triangle à l'interieur du quart en bas
-        # à droite de l'image.
-        triangle_alea = triangle.triangle_aleatoire(
-            (largeur / 2, largeur),
-            (hauteur / 2, hauteur)
-        )
-        couleur = dessin.couleur_aleatoire()
-
-        # on tourne et on affiche 8 fois le triangle
-        for tour in range(8):
-            angle = pi / 4 * tour
-            triangle_tourne = triangle.tourne_triangle_autour(triangle_alea, centre, angle)
-            dessin.affiche_triangle(triangle_tourne, couleur)
-
-    print(svg.genere_balise_fin_groupe())
-    print(svg.genere_balise_fin_image())
+    centre = (largeur / 2, hauteur / 2)
+    generateur = GenerateurTriangles(graine, largeur, hauteur, taille_palette)
+    with svg.SvgWriter(image, largeur, hauteur) as ecrivain:
+        ecrivain.debut_groupe_transp(transparence)
+
+        if instances:
+            ecrivain.debut_definitions()
+            ecrivain.debut_groupe_id("motif")
+            for triangles, couleurs in generateur.lots(nombre_triangles, taille_lot):
+                ecrivain.polygones_tableau(triangles, couleurs)
+            ecrivain.fin_groupe()
+            ecrivain.fin_definitions()
+            for tour in range(symetrie):
+                ecrivain.utilise("motif", f"rotate({360 / symetrie * tour:g} {centre[0]:g} {centre[1]:g})")
+            return
+
+        rotations = triangle.matrices_rotation(symetrie)
+        for triangles, couleurs in generateur.lots(nombre_triangles, taille_lot):
+            # les copies d'un même triangle restent consécutives
+            triangles_tournes = triangle.tourne_triangles_autour(triangles, centre, rotations)
+            ecrivain.polygones_tableau(triangles_tournes.reshape(-1, 3, 2), np.repeat(couleurs, symetrie))
 
 
 def main():
     """On génère un SVG kaléidoscopique à partir d'un nombre de triangles"""
-    if len(sys.argv) != 2 or sys.argv[1] == "-h" or sys.argv[1] == "--help":
-        print("utilisation:", sys.argv[0], "nombre_triangles > image.svg")
-        sys.exit(1)
+    analyseur = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    analyseur.add_argument("nombre_triangles", type=int)
+    analyseur.add_argument("--symetrie", type=int, default=8,
+                           help="nombre de copies tournées de chaque triangle (défaut : 8)")
+    analyseur.add_argument("--instances", action="store_true",
+                           help="écrit les triangles une seule fois et les copie avec des éléments use")
+    analyseur.add_argument("--graine", type=int, help="graine pour une image reproductible")
+    analyseur.add_argument("--palette", type=int, default=256,
+                           help="nombre de couleurs différentes (défaut : 256)")
+    svg.ajoute_options_sortie(analyseur)
+    arguments = analyseur.parse_args()
+    if arguments.symetrie < 1:
+        analyseur.error("--symetrie doit être au moins 1")
+    if arguments.palette < 1:
+        analyseur.error("--palette doit être au moins 1")
 
-    nombre_triangles = int(sys.argv[1])
-    genere_image(nombre_triangles)
+    with svg.ouvre_sortie(arguments.sortie, arguments.compression) as image:
+        genere_image(arguments.nombre_triangles, image, symetrie=arguments.symetrie,
+                     instances=arguments.instances, graine=arguments.graine, taille_palette=arguments.palette)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
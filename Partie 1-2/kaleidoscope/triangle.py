@@ -4,14 +4,19 @@ import random
 import svg
 import math
 
+import numpy as np
+
 def triangle_aleatoire(bornes_abscisses, bornes_hauteur):
     """
     Fonction qui genere aleatoirement un triangle appartenant a une partie du plan definie en parametre.
     """
 
-    point1 = svg.Point(random.randint(bornes_abscisses[0], bornes_abscisses[1]), random.randint(bornes_hauteur[0], bornes_hauteur[1]))
-    point2 = svg.Point(random.randint(bornes_abscisses[0], bornes_abscisses[1]), random.randint(bornes_hauteur[0], bornes_hauteur[1]))
-    point3 = svg.Point(random.randint(bornes_abscisses[0], bornes_abscisses[1]), random.randint(bornes_hauteur[0], bornes_hauteur[1]))
+    # randint n'accepte que des bornes entieres
+    x_min, x_max = int(bornes_abscisses[0]), int(bornes_abscisses[1])
+    y_min, y_max = int(bornes_hauteur[0]), int(bornes_hauteur[1])
+    point1 = svg.Point(random.randint(x_min, x_max), random.randint(y_min, y_max))
+    point2 = svg.Point(random.randint(x_min, x_max), random.randint(y_min, y_max))
+    point3 = svg.Point(random.randint(x_min, x_max), random.randint(y_min, y_max))
     return (point1, point2, point3)
 
 
@@ -33,4 +38,26 @@ def tourne_triangle_autour(triangle, centre, angle):
     x = (point3.x - centre.x)*math.cos(angle) - (point3.y - centre.y)*math.sin(angle) + centre.x
     y = (point3.x - centre.x)*math.sin(angle) + (point3.y - centre.y)*math.cos(angle) + centre.y
     point3 = svg.Point(x, y)
-    return (point1, point2, point3)
\ No newline at end of file
+    return (point1, point2, point3)
+
+
+def matrices_rotation(nombre):
+    """
+    Fonction qui renvoie le tableau (nombre, 2, 2) des rotations d'angle 2*pi*k/nombre, k de 0 a nombre-1.
+    Les matrices sont transposees, pour s'appliquer a des points en ligne : point @ matrice.
+    """
+
+    angles = 2 * math.pi / nombre * np.arange(nombre)
+    cosinus, sinus = np.cos(angles), np.sin(angles)
+    return np.stack((np.stack((cosinus, sinus), axis=-1), np.stack((-sinus, cosinus), axis=-1)), axis=1)
+
+
+def tourne_triangles_autour(triangles, centre, matrices):
+    """
+    Version par lot de tourne_triangle_autour.
+    triangles est un tableau (N, 3, 2), matrices un tableau (R, 2, 2) donne par matrices_rotation.
+    Renvoie le tableau (N, R, 3, 2) des R copies tournees de chaque triangle autour de centre.
+    """
+
+    centre = np.asarray(centre, dtype=float)
+    return np.einsum('nsj,rjk->nrsk', np.asarray(triangles, dtype=float) - centre, matrices) + centre
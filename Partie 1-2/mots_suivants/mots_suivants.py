@@ -5,13 +5,16 @@ Permet l'utilisation de dictionnaires et une imbrication de structures.
 On se sert des donnees pour generer des phrases aleatoires.
 """
 import sys
-from re import finditer
+import re
 from random import choice, random, choices
 from os import system, chdir
 from collections import defaultdict
 from copy import deepcopy
 chdir("/Users/mathis/Desktop/TP_BPI/mots_suivants")
 
+# Un mot est une suite de lettres, tout le reste est ignoré
+MOT = re.compile("[a-zA-Z]+")
+
 
 def get_mots(nom_fichier):
     """Renvoie un tableau dynamique sur tous les mots du fichier.
@@ -21,8 +24,7 @@ def get_mots(nom_fichier):
     mots = []
     with open(nom_fichier, "r") as fichier:
         for ligne in fichier:
-            for mot in finditer("[a-zA-Z]+", ligne):
-                mots.append(mot.group(0))
+            mots.extend(MOT.findall(ligne))
     return mots
 
 
@@ -71,15 +73,21 @@ def compte_mots_suivants(nom_fichier):
     Renvoie un dictionnaire associant a chaque mot m1 du fichier
     un dictionnaire associant a chaque mot m2 suivant m1 dans le
     fichier le nombre de fois ou m2 apparait apres m1.
+
+    Le fichier est lu en une seule passe, ligne par ligne, en ne retenant
+    que le dictionnaire des suivants du mot précédent : la mémoire utilisée
+    ne dépend que de la taille du résultat, pas de celle du texte.
     """
     dict_mots = {}
-
-    liste_mots = get_mots(nom_fichier)
-    for mot in liste_mots:
-        dict_mots[mot] = defaultdict(int)
-    couples = get_couples(liste_mots)
-    for couple_mots in couples:
-        dict_mots[couple_mots[0]][couple_mots[1]] += 1
+    suivants_precedent = None
+    with open(nom_fichier, "r") as fichier:
+        for ligne in fichier:
+            for mot in MOT.findall(ligne):
+                if suivants_precedent is not None:
+                    suivants_precedent[mot] += 1
+                suivants_precedent = dict_mots.get(mot)
+                if suivants_precedent is None:
+                    suivants_precedent = dict_mots[mot] = defaultdict(int)
     return dict_mots
     
 
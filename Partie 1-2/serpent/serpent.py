@@ -1,82 +1,62 @@
 #!/usr/bin/env python3
 
+import argparse
 import sys
-#import numpy as np
+
+import numpy as np
+
 sys.path.append('C:\\Users\mathi\OneDrive\Documents\TP_BPI\SVG')
+import plateau
 import svg
 
 
-def genere_image(hauteur, largeur):
+def cases_serpent(colonnes, nombre_lignes):
+    """Renvoie le tableau (N, 2) des cases (colonne, ligne) du serpent, dans l'ordre du parcours depuis le haut.
+
+    Les lignes paires du plateau sont pleines, chaque ligne impaire n'a
+    qu'une case qui relie la fin d'une ligne pleine au début de la suivante.
+    Le parcours finit en bas à gauche. Le tableau est vide (0, 2) si le
+    plateau n'a ni colonne ni ligne.
+    """
+    if colonnes <= 0 or nombre_lignes <= 0:
+        return np.empty((0, 2), dtype=int)
+    morceaux = []
+    vers_la_droite = nombre_lignes % 2 == 0
+    for rang in range(nombre_lignes):
+        ordre = np.arange(colonnes) if vers_la_droite else np.arange(colonnes - 1, -1, -1)
+        morceaux.append(np.column_stack((ordre, np.full(colonnes, 2 * rang))))
+        if rang < nombre_lignes - 1:
+            morceaux.append(np.array([[ordre[-1], 2 * rang + 1]]))
+        vers_la_droite = not vers_la_droite
+    return np.concatenate(morceaux)
+
+
+def genere_image(hauteur, largeur, image=None, taille_case=40):
     """Génère le jeu du serpent demandé.
-    Affiche le SVG correspondant sur la sortie standard.
+    Ecrit le SVG correspondant dans image, ou sur la sortie standard.
+    Les cases sont des références à une seule case définie une fois, voir
+    le module plateau, et numérotées de 1 (en bas à gauche) à leur nombre.
     """
-    taille_case = 40
-    print(svg.genere_balise_debut_image(largeur, hauteur))
-
-    # Initialisation
-    nb_places_vertical = hauteur // 40
-    nb_places_horizontal = largeur // 40
+    nb_places_vertical = hauteur // taille_case
+    nb_places_horizontal = largeur // taille_case
     nombre_lignes = (nb_places_vertical-1)//2 + 1
-    nombre_cases = nb_places_horizontal*(nombre_lignes) + nombre_lignes - 1
-    
-    direction = (nombre_lignes % 2 == 0)
-    if direction:
-        (x, y) = (0, 0)
-    else:
-        (x, y) = (largeur - taille_case, 0)
-
-    # Creation
-    for i in range(nombre_lignes):
-        for k in range(nb_places_horizontal):
-            print(creer_carre(x, y, taille_case))
-            
-            if direction:
-                x += taille_case/4
-                print(f"<text x={x} y={y+35} fill='red'> {nombre_cases} </text>\n")
-                x += taille_case/4*3
-                nombre_cases -= 1
-            else:
-                x += taille_case/4
-                print(f"<text x={x} y={y+35} fill='red'> {nombre_cases} </text>\n")
-                x -= taille_case/4*5
-                nombre_cases -= 1
+    cases = cases_serpent(nb_places_horizontal, nombre_lignes)
 
-        if direction and nombre_cases != 0:
-            y += taille_case # On descend
-            x -= taille_case/4*3 # On revient a gauche
-            print(f"<text x={x} y={y+35} fill='red'> {nombre_cases} </text>\n")
-            x -= taille_case/4
-            print(creer_carre(x, y, taille_case))
-            nombre_cases -= 1
-        elif not(direction)  and nombre_cases != 0:
-            y += taille_case # On descend
-            x += taille_case/4*5 # On revient a droite
-            print(f"<text x={x} y={y+35} fill='red'> {nombre_cases} </text>\n")
-            x -= taille_case/4
-            print(creer_carre(x, y, taille_case))
-            nombre_cases -= 1
-        direction = direction ^ True
-        y += taille_case
-
-    print(svg.genere_balise_fin_image())
-
-
-def creer_carre(x, y, taille):
-    """
-    Creer in carre de taille donnee a une certaine cordonnee.
-    """
-    return f"<rect x={x} y={y} width={taille} height={taille} style='fill:none;stroke:black;stroke-width:2'/>\n"
+    with svg.SvgWriter(image if image is not None else sys.stdout, largeur, hauteur) as ecrivain:
+        plateau.ecrit_cases(ecrivain, cases, taille_case)
+        plateau.ecrit_numeros(ecrivain, cases, range(len(cases), 0, -1), taille_case)
 
 
 def main():
     """On génère un SVG du jeu du serpent"""
-    if len(sys.argv) != 3 or sys.argv[1] == "-h" or sys.argv[1] == "--help":
-        print("utilisation:", sys.argv[0], "hauteur largeur > image.svg")
-        sys.exit(1)
-
-    hauteur = int(sys.argv[1])
-    largeur = int(sys.argv[2])
-    genere_image(hauteur, largeur)
+    analyseur = argparse.ArgumentParser(description="Génère le plateau du jeu du serpent en SVG.")
+    analyseur.add_argument("hauteur", type=int)
+    analyseur.add_argument("largeur", type=int)
+    svg.ajoute_options_sortie(analyseur)
+    arguments = analyseur.parse_args()
+
+    with svg.ouvre_sortie(arguments.sortie, arguments.compression) as image:
+        genere_image(arguments.hauteur, arguments.largeur, image)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+"""
+Algorithmes de génération de labyrinthes par creusement.
+
+Contrairement à la division récursive de labyrinthe.py, ces algorithmes
+partent d'une grille pleine (cree_grille(..., pleine=True)) et ouvrent des
+passages jusqu'à obtenir un labyrinthe parfait. Ils ont tous la même
+signature que genere_labyrinthe : (grille, progression, alea), et n'utilisent
+en plus de la grille que des tableaux compacts indexés par numéro de case.
+"""
+
+from array import array
+import random
+
+from grille_labyrinthe import HAUT, DROITE, BAS, GAUCHE, OPPOSES
+
+
+def _ouvre(grille, indice, direction, decalage):
+    """ Ouvre le passage entre la case indice et sa voisine indice + decalage. """
+    grille.murs[indice] &= ~direction
+    grille.murs[indice + decalage] &= ~OPPOSES[direction]
+
+
+def _directions_possibles(largeur, nb_cases, indice):
+    """ Renvoie les couples (direction, décalage) qui restent dans la grille depuis la case indice. """
+    possibles = []
+    if indice >= largeur:
+        possibles.append((HAUT, -largeur))
+    if indice + largeur < nb_cases:
+        possibles.append((BAS, largeur))
+    if indice % largeur != 0:
+        possibles.append((GAUCHE, -1))
+    if (indice + 1) % largeur != 0:
+        possibles.append((DROITE, 1))
+    return possibles
+
+
+def genere_kruskal(grille, progression = None, alea = random):
+    """ Algorithme de Kruskal : ouvre les murs dans un ordre aléatoire s'ils séparent deux composantes.
+
+    Les murs intérieurs sont numérotés indice * 2 (mur de droite) et
+    indice * 2 + 1 (mur du bas) et mélangés dans un array('I'). Les composantes
+    sont suivies par un union-find à base de tableaux (parents, rangs), avec
+    compression de chemin et union par rang.
+    """
+    largeur, hauteur, _ = grille
+    nb_cases = largeur * hauteur
+    murs = array('I', range(2 * nb_cases))
+    alea.shuffle(murs)
+    parents = array('I', range(nb_cases))
+    rangs = bytearray(nb_cases)
+
+    def racine(indice):
+        while parents[indice] != indice:
+            parents[indice] = parents[parents[indice]] # compression par moitié
+            indice = parents[indice]
+        return indice
+
+    unions = 0
+    for mur in murs:
+        indice, bas = divmod(mur, 2)
+        if bas:
+            if indice + largeur >= nb_cases:
+                continue
+            direction, decalage = BAS, largeur
+        else:
+            if (indice + 1) % largeur == 0:
+                continue
+            direction, decalage = DROITE, 1
+        racine1, racine2 = racine(indice), racine(indice + decalage)
+        if racine1 == racine2:
+            continue
+        if rangs[racine1] < rangs[racine2]:
+            racine1, racine2 = racine2, racine1
+        parents[racine2] = racine1
+        if rangs[racine1] == rangs[racine2]:
+            rangs[racine1] += 1
+        _ouvre(grille, indice, direction, decalage)
+        unions += 1
+        if progression is not None:
+            progression(unions + 1, nb_cases)
+        if unions == nb_cases - 1:
+            break
+
+
+def genere_wilson(grille, progression = None, alea = random):
+    """ Algorithme de Wilson : marches aléatoires à boucles effacées.
+
+    Depuis chaque case hors de l'arbre, on marche au hasard en retenant dans un
+    bytearray la dernière direction prise depuis chaque case (ce qui efface
+    les boucles), jusqu'à toucher l'arbre ; on creuse alors le chemin retenu.
+    Donne un arbre couvrant uniforme, mais les premières marches sont longues.
+    """
+    largeur, hauteur, _ = grille
+    nb_cases = largeur * hauteur
+    decalages = {HAUT: -largeur, BAS: largeur, GAUCHE: -1, DROITE: 1}
+    dans_arbre = bytearray(nb_cases)
+    sorties = bytearray(nb_cases)
+    dans_arbre[alea.randrange(nb_cases)] = 1
+    cases_dans_arbre = 1
+
+    for depart in range(nb_cases):
+        if dans_arbre[depart]:
+            continue
+        # Marche aléatoire jusqu'à l'arbre
+        indice = depart
+        while not dans_arbre[indice]:
+            direction, decalage = alea.choice(_directions_possibles(largeur, nb_cases, indice))
+            sorties[indice] = direction
+            indice += decalage
+        # On creuse le chemin sans boucles
+        indice = depart
+        while not dans_arbre[indice]:
+            direction = sorties[indice]
+            _ouvre(grille, indice, direction, decalages[direction])
+            dans_arbre[indice] = 1
+            cases_dans_arbre += 1
+            indice += decalages[direction]
+        if progression is not None:
+            progression(cases_dans_arbre, nb_cases)
+
+
+def genere_arbre_croissant(grille, progression = None, alea = random, proportion_recente = 0.5):
+    """ Algorithme de l'arbre croissant (growing tree).
+
+    On garde dans un array les cases actives ; à chaque étape on en prend une,
+    la plus récente avec la probabilité proportion_recente (labyrinthe en
+    longs couloirs, comme un parcours en profondeur), une au hasard sinon
+    (labyrinthe plus buissonnant, comme Prim), et on creuse vers un voisin
+    non visité. Une case sans voisin libre est retirée de la liste en la
+    remplaçant par la dernière, l'ordre des cases actives n'est donc
+    qu'approximativement celui de leur ajout.
+    """
+    largeur, hauteur, _ = grille
+    nb_cases = largeur * hauteur
+    visitees = bytearray(nb_cases)
+    depart = alea.randrange(nb_cases)
+    visitees[depart] = 1
+    actives = array('I', [depart])
+    cases_visitees = 1
+
+    while actives:
+        position = len(actives) - 1 if alea.random() < proportion_recente else alea.randrange(len(actives))
+        indice = actives[position]
+        libres = [(direction, decalage) for direction, decalage in _directions_possibles(largeur, nb_cases, indice)
+                  if not visitees[indice + decalage]]
+        if not libres:
+            # Retrait en O(1) : on remplace par la dernière case active
+            actives[position] = actives[-1]
+            actives.pop()
+            continue
+        direction, decalage = alea.choice(libres)
+        _ouvre(grille, indice, direction, decalage)
+        visitees[indice + decalage] = 1
+        actives.append(indice + decalage)
+        cases_visitees += 1
+        if progression is not None:
+            progression(cases_visitees, nb_cases)
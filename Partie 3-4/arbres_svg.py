@@ -1,11 +1,33 @@
 #!/usr/bin/env python3
 """ Module python permettant le tracé d'un arbre en SVG. """
 
-from random import randint, random
+from random import randint, random, Random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from heapq import heappush, heappop
+import argparse
+import io
+import sys
 from math import sqrt, cos, sin, pi, atan
 
+import numpy as np
 import svg
 
+# Limites (x_min, y_min, x_max) hors desquelles une branche n'est pas tracée
+CADRE = (50, 50, 750)
+
+# Niveau de détail : vue (x_min, y_min, x_max, y_max) visible, echelle en pixels
+# par unité, pixel_min la taille en pixels sous laquelle une branche n'est pas
+# tracée et pixel_fusion celle sous laquelle son sous-arbre n'est plus développé
+Detail = namedtuple('Detail', 'vue echelle pixel_min pixel_fusion')
+
+# Rayon, en longueurs de branche autour de son arrivée, du disque qui contient
+# la branche et, en général, son sous-arbre. Ce n'est pas une borne : un enfant
+# peut être aussi long que son parent, et ses enfants aussi, mais les longueurs
+# diminuent de moitié en moyenne à chaque génération.
+ENVELOPPE = 2
+
 def distance(point1, point2):
     """ Fonction qui renvoie la distance carthésienne. """
     return sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2)
@@ -22,38 +44,254 @@ def recup_angle(point1, point2):
         return atan((point1.y - point2.y)/(point2.x - point1.x))
     return pi - atan((point1.y - point2.y)/(point1.x - point2.x))
 
-def genere_branche(point_depart, point_arrivee, taille_limite, image):
-    """ Fonction recursive qui s'occupe de la génération des branches d'un arbre. """
-    taille_branche = distance(point_depart, point_arrivee)
-    if taille_branche < taille_limite:
-        return
-    if point_arrivee.y < 50 or point_arrivee.x < 50 or point_arrivee.x > 750:
-        return
-
-    print(svg.genere_segment(point_depart, point_arrivee), file = image)
-    nb_branches = randint(2, 4)
-    for _ in range(nb_branches):
+def enveloppe_visible(point_arrivee, taille_branche, vue):
+    """ Indique si le disque d'ENVELOPPE longueurs de branche autour de son arrivée touche la vue. """
+    x = min(max(point_arrivee.x, vue[0]), vue[2])
+    y = min(max(point_arrivee.y, vue[1]), vue[3])
+    return (x - point_arrivee.x)**2 + (y - point_arrivee.y)**2 <= (ENVELOPPE * taille_branche)**2
+
+def genere_arbre(point_depart, point_arrivee, taille_limite, image,
+                 max_branches = None, max_profondeur = None, max_octets = None, alea = None, cadre = CADRE,
+                 detail = None):
+    """ Génère un arbre branche par branche dans un budget, renvoie le nombre de branches tracées.
+
+    Les branches en attente sont dans une file de priorité, la plus longue
+    d'abord : l'arbre est construit à peu près niveau par niveau, et quand un
+    budget est atteint (nombre de branches, profondeur, ou taille estimée du
+    SVG en octets) ce sont les plus petites branches restantes qui sont
+    abandonnées. Chaque branche tracée, de longueur L, a de 2 à 4 enfants qui
+    partent entre les deux tiers et le bout de la branche, avec un écart
+    d'angle d'au plus 60 degrés et une longueur d'au plus L ; les branches
+    plus courtes que taille_limite ne sont pas tracées.
+
+    alea est un random.Random pour un arbre reproductible (le générateur
+    global par défaut), cadre remplace les limites CADRE. detail (un Detail)
+    adapte l'arbre à sa résolution d'affichage : les branches de moins de
+    pixel_min pixels ne sont pas tracées, celles de moins de pixel_fusion
+    pixels sont tracées seules (leur sous-arbre, de quelques pixels, est
+    confondu avec elles) et les sous-arbres dont l'enveloppe sort de la vue
+    sont abandonnés avant d'être développés. Un sous-arbre abandonné ne fait
+    pas ses tirages : avec la même graine, le reste de l'arbre peut changer.
+    """
+    entier, reel = (randint, random) if alea is None else (alea.randint, alea.random)
+    if detail is not None:
+        taille_limite = max(taille_limite, detail.pixel_min / detail.echelle)
+    # (-longueur, numéro d'ordre pour départager, profondeur, départ, arrivée)
+    file = [(-distance(point_depart, point_arrivee), 0, 0, point_depart, point_arrivee)]
+    numero = 1
+    branches = 0
+    octets = 0
+
+    while file:
+        moins_taille, _, profondeur, point_depart, point_arrivee = heappop(file)
+        taille_branche = -moins_taille
+        if taille_branche < taille_limite:
+            break # toutes les branches restantes sont plus petites
+        if point_arrivee.y < cadre[1] or point_arrivee.x < cadre[0] or point_arrivee.x > cadre[2]:
+            continue
+        if detail is not None and not enveloppe_visible(point_arrivee, taille_branche, detail.vue):
+            continue
+        if max_branches is not None and branches >= max_branches:
+            break
+        if max_octets is not None:
+            octets += image.taille_segment(point_depart, point_arrivee)
+            if octets > max_octets:
+                break
+
+        image.segment(point_depart, point_arrivee)
+        branches += 1
+        if max_profondeur is not None and profondeur >= max_profondeur:
+            continue
+        if detail is not None and taille_branche * detail.echelle < detail.pixel_fusion:
+            continue # sous-arbre fusionné dans la branche
+
         ancien_angle = recup_angle(point_depart, point_arrivee)
-        nouveau_depart = deplacement(point_depart, ancien_angle, (1-random()/3)*taille_branche)
-        nouvel_angle = (random()-0.5)*2/3*pi + ancien_angle
-        longueur = random()*taille_branche
-        nouvelle_arrivee = deplacement(nouveau_depart, nouvel_angle, longueur)
-        genere_branche(nouveau_depart, nouvelle_arrivee, taille_limite, image)
+        for _ in range(entier(2, 4)):
+            nouveau_depart = deplacement(point_depart, ancien_angle, (1-reel()/3)*taille_branche)
+            nouvel_angle = (reel()-0.5)*2/3*pi + ancien_angle
+            longueur = reel()*taille_branche
+            nouvelle_arrivee = deplacement(nouveau_depart, nouvel_angle, longueur)
+            heappush(file, (-longueur, numero, profondeur + 1, nouveau_depart, nouvelle_arrivee))
+            numero += 1
+
+    return branches
+
+def genere_arbre_vectorise(point_depart, point_arrivee, taille_limite, image, alea = None, max_profondeur = None,
+                           cadre = CADRE, detail = None):
+    """ Version NumPy de genere_arbre, génération par génération.
+
+    Toutes les branches d'une génération sont dans des tableaux (N, 2) de
+    départs et d'arrivées : le filtrage, l'écriture (en un seul lot), le
+    tirage du nombre d'enfants et des positions et les calculs
+    trigonométriques sont faits sur tout le tableau d'un coup. alea est un
+    numpy.random.Generator (un nouveau par défaut), detail a le même rôle
+    que pour genere_arbre. Renvoie le nombre de branches tracées.
+    """
+    if alea is None:
+        alea = np.random.default_rng()
+    if detail is not None:
+        taille_limite = max(taille_limite, detail.pixel_min / detail.echelle)
+        vue_min, vue_max = np.array(detail.vue[:2], dtype=float), np.array(detail.vue[2:], dtype=float)
+    departs = np.array([point_depart], dtype=float)
+    arrivees = np.array([point_arrivee], dtype=float)
+    branches = 0
+    profondeur = 0
+
+    while len(departs):
+        ecarts = arrivees - departs
+        tailles = np.hypot(ecarts[:, 0], ecarts[:, 1])
+        gardees = (tailles >= taille_limite) & (arrivees[:, 1] >= cadre[1]) \
+            & (arrivees[:, 0] >= cadre[0]) & (arrivees[:, 0] <= cadre[2])
+        if detail is not None:
+            ecarts_vue = np.clip(arrivees, vue_min, vue_max) - arrivees
+            gardees &= np.einsum('ij,ij->i', ecarts_vue, ecarts_vue) <= (ENVELOPPE * tailles)**2
+        departs, arrivees, ecarts, tailles = departs[gardees], arrivees[gardees], ecarts[gardees], tailles[gardees]
+        image.segments_tableau(np.hstack((departs, arrivees)))
+        branches += len(departs)
+        if max_profondeur is not None and profondeur >= max_profondeur:
+            break
+        if detail is not None:
+            developpees = tailles * detail.echelle >= detail.pixel_fusion
+            departs, ecarts, tailles = departs[developpees], ecarts[developpees], tailles[developpees]
+
+        # Même angle que recup_angle, y compris pour les branches verticales
+        angles = np.where(ecarts[:, 0] == 0, pi/2, np.arctan2(-ecarts[:, 1], ecarts[:, 0]))
+        parents = np.repeat(np.arange(len(departs)), alea.integers(2, 5, size=len(departs)))
+        anciens_angles, tailles = angles[parents], tailles[parents]
+        recul, ecart_angle, proportion = alea.random((3, len(parents)))
+
+        departs = departs[parents] + ((1 - recul/3) * tailles)[:, None] \
+            * np.column_stack((np.cos(anciens_angles), -np.sin(anciens_angles)))
+        nouveaux_angles = (ecart_angle - 0.5)*2/3*pi + anciens_angles
+        arrivees = departs + (proportion * tailles)[:, None] \
+            * np.column_stack((np.cos(nouveaux_angles), -np.sin(nouveaux_angles)))
+        profondeur += 1
+
+    return branches
+
+def genere_fragment(tache):
+    """ Génère un arbre de forêt, éventuellement dans un processus de travail.
+
+    tache est un tuple (départ, arrivée, graine, numéro, options) où options
+    sont les paramètres nommés de genere_arbre (plus vectorise). L'arbre est
+    tiré avec une graine dérivée de graine et numéro. Renvoie le couple
+    (fragment SVG des branches, nombre de branches).
+    """
+    point_depart, point_arrivee, graine, numero, options = tache
+    options = dict(options)
+    fragment = io.StringIO()
+    image = svg.SvgWriter(fragment, 0, 0, mode_chemin=not options["vectorise"])
+    if options.pop("vectorise"):
+        options.pop("max_branches")
+        options.pop("max_octets")
+        branches = genere_arbre_vectorise(point_depart, point_arrivee, options.pop("taille_limite"), image,
+                                          np.random.default_rng([graine, numero]), **options)
+    else:
+        branches = genere_arbre(point_depart, point_arrivee, options.pop("taille_limite"), image,
+                                alea=Random(f"{graine}/{numero}"), **options)
+    image.vide()
+    return fragment.getvalue(), branches
+
+def cadre_image(largeur):
+    """ Renvoie les limites (x_min, y_min, x_max) des branches pour une image de largeur donnée, CADRE pour 800. """
+    return (CADRE[0], CADRE[1], largeur - CADRE[0])
+
+def genere_foret(nombre, largeur, hauteur, graine, image, processus = None, **options):
+    """ Trace une forêt de nombre arbres répartis sur la largeur de l'image, renvoie le nombre de branches.
+
+    La position et la taille des troncs sont tirées avec Random(graine),
+    chaque arbre avec une graine qui ne dépend que de graine et de son numéro.
+    Les arbres sont générés dans un ProcessPoolExecutor à processus
+    travailleurs (1 pour tout faire dans ce processus) et leurs fragments
+    recopiés dans l'ordre : l'image ne dépend que de la graine.
+    options sont les paramètres nommés de genere_fragment ; les budgets
+    max_branches et max_octets valent pour toute la forêt et sont répartis
+    entre les arbres.
+    """
+    alea = Random(graine)
+    espacement = largeur / nombre
+    options["cadre"] = cadre_image(largeur)
+    taches = []
+    for numero in range(nombre):
+        x = espacement * (numero + 0.5) + alea.uniform(-espacement / 4, espacement / 4)
+        tronc = alea.uniform(0.5, 1) * hauteur / 3
+        options_arbre = dict(options)
+        for budget in ("max_branches", "max_octets"):
+            if options.get(budget) is not None:
+                # les premiers arbres prennent le reste de la division
+                options_arbre[budget] = options[budget] // nombre + (numero < options[budget] % nombre)
+        taches.append((svg.Point(x, hauteur - 50), svg.Point(x, hauteur - 50 - tronc), graine, numero, options_arbre))
+
+    branches = 0
+    with ProcessPoolExecutor(max_workers=processus) if processus != 1 else nullcontext() as executeur:
+        resultats = map(genere_fragment, taches) if executeur is None else executeur.map(genere_fragment, taches)
+        for fragment, branches_arbre in resultats:
+            image.write(fragment)
+            branches += branches_arbre
+    return branches
 
 def main():
     """ Fonction centrale qui va gérer la création de l'arbre. """
-    image = open('arbre.svg', 'w+')
-    print(svg.genere_balise_debut_image(800, 600), file = image)
-    # Fond de l'image noir
-    print(svg.genere_balise_debut_groupe('black', 'black', 1), file = image)
-    print(svg.genere_rectangle(svg.Point(0,0), 800, 600), file = image)
-    print(svg.genere_balise_fin_groupe(), file = image)
-
-    # L'arbre en blanc
-    print(svg.genere_balise_debut_groupe('white', 'none', 1), file = image)
-    genere_branche(svg.Point(400, 550), svg.Point(400, 350), 5, image)
-    print(svg.genere_balise_fin_groupe(), file = image)
-    print(svg.genere_balise_fin_image(), file = image)
+    analyseur = argparse.ArgumentParser(description="Génère un arbre au format SVG.")
+    analyseur.add_argument("--taille-limite", type=float, default=5,
+                           help="longueur en dessous de laquelle on ne trace plus de branche (défaut : 5)")
+    analyseur.add_argument("--max-branches", type=int, help="nombre maximal de branches tracées, pour toute l'image")
+    analyseur.add_argument("--max-profondeur", type=int, help="nombre maximal de générations après le tronc")
+    analyseur.add_argument("--max-octets", type=int, help="taille maximale estimée des branches dans le SVG, pour toute l'image")
+    analyseur.add_argument("--vectorise", action="store_true",
+                           help="calcule chaque génération de branches d'un coup avec NumPy (ignore --max-branches et --max-octets)")
+    analyseur.add_argument("--graine", type=int, help="graine pour une image reproductible")
+    analyseur.add_argument("--foret", type=int, metavar="NOMBRE", help="trace une forêt de NOMBRE arbres")
+    analyseur.add_argument("--largeur", type=int, default=800, help="largeur de l'image (défaut : 800)")
+    analyseur.add_argument("--hauteur", type=int, default=600, help="hauteur de l'image (défaut : 600)")
+    analyseur.add_argument("--processus", type=int, help="nombre de processus pour --foret (défaut : tous les cœurs)")
+    analyseur.add_argument("--resolution", type=int,
+                           help="largeur en pixels à laquelle l'image sera affichée (défaut : --largeur)")
+    analyseur.add_argument("--pixel-min", type=float,
+                           help="taille affichée en pixels sous laquelle une branche est omise (défaut : 0.5)")
+    analyseur.add_argument("--pixel-fusion", type=float,
+                           help="taille affichée en pixels sous laquelle le sous-arbre d'une branche est omis (défaut : 0)")
+    svg.ajoute_options_sortie(analyseur, "arbre.svg")
+    arguments = analyseur.parse_args()
+    largeur, hauteur = arguments.largeur, arguments.hauteur
+    # Sans option de détail, l'arbre n'est ni élagué ni réduit à la vue : il
+    # reste celui que donne la graine
+    detail = None
+    if (arguments.resolution, arguments.pixel_min, arguments.pixel_fusion) != (None, None, None):
+        echelle = (arguments.resolution or largeur) / largeur
+        detail = Detail((0, 0, largeur, hauteur), echelle,
+                        0.5 if arguments.pixel_min is None else arguments.pixel_min, arguments.pixel_fusion or 0)
+
+    with svg.ouvre_sortie(arguments.sortie, arguments.compression) as fichier, svg.SvgWriter(fichier, largeur, hauteur, mode_chemin=not arguments.vectorise) as image:
+        # Fond de l'image noir
+        image.debut_groupe('black', 'black', 1)
+        image.rectangle(svg.Point(0,0), largeur, hauteur)
+        image.fin_groupe()
+
+        # L'arbre en blanc
+        image.debut_groupe('white', 'none', 1)
+        if arguments.foret:
+            graine = arguments.graine if arguments.graine is not None else randint(0, 2**32 - 1)
+            branches = genere_foret(arguments.foret, largeur, hauteur, graine, image, arguments.processus,
+                                    taille_limite=arguments.taille_limite, vectorise=arguments.vectorise,
+                                    max_branches=arguments.max_branches, max_profondeur=arguments.max_profondeur,
+                                    max_octets=arguments.max_octets, detail=detail)
+        else:
+            # Tronc au milieu, du bas de l'image sur un tiers de sa hauteur
+            # ((400, 550) à (400, 350) en 800x600)
+            depart = svg.Point(largeur / 2, hauteur - 50)
+            arrivee = svg.Point(largeur / 2, hauteur - 50 - hauteur / 3)
+            if arguments.vectorise:
+                branches = genere_arbre_vectorise(depart, arrivee, arguments.taille_limite, image,
+                                                  np.random.default_rng(arguments.graine), arguments.max_profondeur,
+                                                  cadre_image(largeur), detail)
+            else:
+                alea = None if arguments.graine is None else Random(arguments.graine)
+                branches = genere_arbre(depart, arrivee, arguments.taille_limite, image,
+                                        arguments.max_branches, arguments.max_profondeur, arguments.max_octets, alea,
+                                        cadre_image(largeur), detail)
+        image.fin_groupe()
+    print(f"{branches} branches tracées", file=sys.stderr)
 
 if __name__ == '__main__':
     main()
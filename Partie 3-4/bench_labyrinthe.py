@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compare les algorithmes de génération de labyrinthe de labyrinthe.py :
+débit en cases par seconde et pic de mémoire, sur des grilles carrées de
+tailles croissantes.
+
+Chaque mesure est faite dans un processus neuf, pour que le pic de mémoire
+(ru_maxrss) ne soit pas pollué par les mesures précédentes. On affiche
+l'augmentation du pic pendant la génération, sans le coût fixe de
+l'interpréteur et des modules importés.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import random
+import resource
+import sys
+import time
+
+from grille_labyrinthe import cree_grille
+from labyrinthe import ALGORITHMES
+
+# ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+OCTETS_PAR_UNITE_RSS = 1 if sys.platform == "darwin" else 1024
+
+
+def mesure(nom_algorithme, cote, graine):
+    """ Génère un labyrinthe de cote x cote cases et renvoie (durée en s, pic de mémoire en octets). """
+    algorithme = ALGORITHMES[nom_algorithme]
+    pic_avant = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    debut = time.perf_counter()
+    grille = cree_grille(cote, cote, algorithme.grille_pleine)
+    algorithme.genere(grille, None, random.Random(graine))
+    duree = time.perf_counter() - debut
+    pic_apres = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return duree, (pic_apres - pic_avant) * OCTETS_PAR_UNITE_RSS
+
+
+def main():
+    """ Lance les mesures demandées et affiche le tableau des résultats. """
+    analyseur = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    analyseur.add_argument("--tailles", type=int, nargs='+', default=[256, 512, 1024, 2048, 4096],
+                           help="côtés des grilles à mesurer (défaut : 256 à 4096)")
+    analyseur.add_argument("--algorithmes", choices=ALGORITHMES, nargs='+', default=list(ALGORITHMES))
+    analyseur.add_argument("--graine", type=int, default=0)
+    arguments = analyseur.parse_args()
+
+    print(f"{'algorithme':<16} {'grille':>11} {'durée (s)':>10} {'cases/s':>12} {'pic (Mo)':>10}")
+    for cote in arguments.tailles:
+        for nom in arguments.algorithmes:
+            with ProcessPoolExecutor(max_workers=1) as executeur:
+                duree, pic = executeur.submit(mesure, nom, cote, arguments.graine).result()
+            print(f"{nom:<16} {f'{cote}x{cote}':>11} {duree:>10.2f} {cote * cote / duree:>12.0f} {pic / 2**20:>10.1f}",
+                  flush=True)
+
+
+if __name__ == '__main__':
+    main()
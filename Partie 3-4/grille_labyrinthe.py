@@ -0,0 +1,78 @@
+"""
+Représentation compacte d'un labyrinthe, indépendante de son affichage.
+
+Le labyrinthe est une grille de largeur x hauteur cases stockée dans un
+bytearray, à raison d'un octet par case. Chaque octet contient un bit par
+direction (HAUT, DROITE, BAS, GAUCHE), à 1 si la case a un mur de ce côté.
+Un mur entre deux cases voisines est toujours noté des deux côtés.
+"""
+
+from collections import namedtuple
+
+HAUT = 1
+DROITE = 2
+BAS = 4
+GAUCHE = 8
+DIRECTIONS = (HAUT, DROITE, BAS, GAUCHE)
+TOUS_LES_MURS = HAUT | DROITE | BAS | GAUCHE
+
+# Déplacement (dx, dy) correspondant à chaque direction et direction opposée
+DEPLACEMENTS = {HAUT: (0, -1), DROITE: (1, 0), BAS: (0, 1), GAUCHE: (-1, 0)}
+OPPOSES = {HAUT: BAS, DROITE: GAUCHE, BAS: HAUT, GAUCHE: DROITE}
+
+Grille = namedtuple('Grille', 'largeur hauteur murs')
+
+
+def cree_grille(largeur, hauteur, pleine=False):
+    """ Crée une grille de largeur x hauteur cases.
+
+    Si pleine est faux, seuls les bords extérieurs ont des murs (point de
+    départ des algorithmes qui ajoutent des murs). Sinon toutes les cases sont
+    fermées (point de départ des algorithmes qui creusent des passages).
+    """
+    if pleine:
+        return Grille(largeur, hauteur, bytearray([TOUS_LES_MURS]) * (largeur * hauteur))
+    grille = Grille(largeur, hauteur, bytearray(largeur * hauteur))
+    for x in range(largeur):
+        grille.murs[x] |= HAUT
+        grille.murs[(hauteur - 1) * largeur + x] |= BAS
+    for y in range(hauteur):
+        grille.murs[y * largeur] |= GAUCHE
+        grille.murs[y * largeur + largeur - 1] |= DROITE
+    return grille
+
+
+def a_un_mur(grille, x, y, direction):
+    """ Indique si la case (x, y) a un mur dans la direction donnée. """
+    return grille.murs[y * grille.largeur + x] & direction != 0
+
+
+def voisin(grille, x, y, direction):
+    """ Renvoie la case voisine de (x, y) dans la direction donnée, ou None au bord. """
+    deplacement_x, deplacement_y = DEPLACEMENTS[direction]
+    x, y = x + deplacement_x, y + deplacement_y
+    if 0 <= x < grille.largeur and 0 <= y < grille.hauteur:
+        return x, y
+    return None
+
+
+def ajoute_mur(grille, x, y, direction):
+    """ Ajoute un mur du côté direction de la case (x, y), et chez son voisin. """
+    grille.murs[y * grille.largeur + x] |= direction
+    case_voisine = voisin(grille, x, y, direction)
+    if case_voisine is not None:
+        grille.murs[case_voisine[1] * grille.largeur + case_voisine[0]] |= OPPOSES[direction]
+
+
+def retire_mur(grille, x, y, direction):
+    """ Ouvre un passage du côté direction de la case (x, y), et chez son voisin. """
+    grille.murs[y * grille.largeur + x] &= ~direction
+    case_voisine = voisin(grille, x, y, direction)
+    if case_voisine is not None:
+        grille.murs[case_voisine[1] * grille.largeur + case_voisine[0]] &= ~OPPOSES[direction]
+
+
+def ouvre_entree_sortie(grille):
+    """ Ouvre l'entrée en haut de la case (0, 0) et la sortie en bas de la dernière case. """
+    grille.murs[0] &= ~HAUT
+    grille.murs[-1] &= ~BAS
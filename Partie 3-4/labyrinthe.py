@@ -2,160 +2,386 @@
 # pylint: disable=line-too-long
 
 """
-Fichier python qui va générer récursivement un labyrithe et l'afficher sous
-format d'une image svg.
+Fichier python qui va générer par divisions récursives un labyrithe et l'afficher sous
+format d'une image svg, texte ou pgm.
 """
 
-from random import randint
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import argparse
+import os
+import random
+import re
 import sys
+import time
 import svg
+from grille_labyrinthe import HAUT, DROITE, BAS, GAUCHE, Grille, cree_grille, ajoute_mur, ouvre_entree_sortie
+from solveur_labyrinthe import SOLVEURS
+from algorithmes_labyrinthe import genere_kruskal, genere_wilson, genere_arbre_croissant
 
+# Tables de traduction d'un octet de murs vers 1 ou 0 selon une direction,
+# pour chercher les suites de murs alignés avec RUN_DE_MURS
+TABLES_MURS = {direction: bytes(1 if octet & direction else 0 for octet in range(256))
+               for direction in (HAUT, DROITE, BAS, GAUCHE)}
+RUN_DE_MURS = re.compile(b"\x01+")
 
-def genere_labyrinthe(top_left, down_right, entree, sortie, taille_case, image, trace = False):
-    """ Fonction qui trace le labyrinthe en appelant une fonction récursive"""
 
-    if down_right[0] - top_left[0] <= taille_case and down_right[1] - top_left[1] <= taille_case:
-        if trace is True:
-            entree_sortie = recupere_entree_sortie(entree, sortie)
-            haut_gauche = [min(entree[0], sortie[0]), min([entree[1], sortie[1]])]
-            trace_solution(entree_sortie, haut_gauche, taille_case, image)
-        return
+def divise_zone(grille, zone, alea):
+    """ Coupe la zone ((x1, y1), (x2, y2)) en deux par un mur percé d'une porte.
+
+    Renvoie les deux sous-zones, ou None si la zone ne fait qu'une case.
+    """
+    top_left, down_right = zone
+    if down_right[0] - top_left[0] <= 1 and down_right[1] - top_left[1] <= 1:
+        return None
 
     # On regarde si le rectangle est plus en largeur ou en hauteur
     if down_right[0] - top_left[0] > down_right[1] - top_left[1]: # Largeur
-        position_barre = randint(top_left[0] // taille_case + 1, down_right[0] // taille_case - 1) * taille_case
-        position_porte = randint(top_left[1] // taille_case, down_right[1] // taille_case - 1) * taille_case
-        porte = [position_barre, position_porte, position_barre, position_porte + taille_case]
+        position_barre = alea.randint(top_left[0] + 1, down_right[0] - 1)
+        position_porte = alea.randint(top_left[1], down_right[1] - 1)
 
-        print(svg.genere_segment(svg.Point(position_barre, top_left[1]), svg.Point(position_barre, porte[1])), file = image)
-        print(svg.genere_segment(svg.Point(position_barre, porte[1]+taille_case), svg.Point(position_barre, down_right[1])), file = image)
+        for y in range(top_left[1], down_right[1]):
+            if y != position_porte:
+                ajoute_mur(grille, position_barre, y, GAUCHE)
 
-        # Recursion
-        if trace is False:
-            genere_labyrinthe(top_left, [position_barre, down_right[1]], [], [], taille_case, image)
-            genere_labyrinthe([position_barre, top_left[1]], down_right, [], [], taille_case, image)
-        else:
-            if entree[0] > sortie[0]:
-                (entree, sortie) = (sortie, entree)
-            if position_barre > min(entree[0], entree[2], sortie[0], sortie[2]):
-                if position_barre < max(entree[0], entree[2], sortie[0], sortie[2]):
-                    genere_labyrinthe(top_left, [position_barre, down_right[1]], entree, porte, taille_case, image, trace = True)
-                    genere_labyrinthe([position_barre, top_left[1]], down_right, porte, sortie, taille_case, image, trace = True)
-                else:
-                    genere_labyrinthe(top_left, [position_barre, down_right[1]], entree, sortie, taille_case, image, trace = True)
-                    genere_labyrinthe([position_barre, top_left[1]], down_right, [], [], taille_case, image)
-            else:
-                genere_labyrinthe(top_left, [position_barre, down_right[1]], [], [], taille_case, image)
-                genere_labyrinthe([position_barre, top_left[1]], down_right, entree, sortie, taille_case, image, trace = True)
+        return (top_left, (position_barre, down_right[1])), ((position_barre, top_left[1]), down_right)
 
-    else: # Hauteur
-        position_barre = randint(top_left[1] // taille_case + 1, down_right[1] // taille_case - 1) * taille_case
-        position_porte = randint(top_left[0] // taille_case, down_right[0] // taille_case - 1) * taille_case
-        porte = [position_porte, position_barre, position_porte + taille_case, position_barre]
+    # Hauteur
+    position_barre = alea.randint(top_left[1] + 1, down_right[1] - 1)
+    position_porte = alea.randint(top_left[0], down_right[0] - 1)
 
-        print(svg.genere_segment(svg.Point(top_left[0], position_barre), svg.Point(porte[0], position_barre)), file = image)
-        print(svg.genere_segment(svg.Point(porte[0]+taille_case, position_barre), svg.Point(down_right[0], position_barre)), file = image)
+    for x in range(top_left[0], down_right[0]):
+        if x != position_porte:
+            ajoute_mur(grille, x, position_barre, HAUT)
 
-        # Recursion
-        if trace is False:
-            genere_labyrinthe(top_left, [down_right[0], position_barre], [], [], taille_case, image)
-            genere_labyrinthe([top_left[0], position_barre], down_right, [], [], taille_case, image)
-        else:
-            if entree[1] > sortie[1]:
-                (entree, sortie) = (sortie, entree)
-            if position_barre > min(entree[1], entree[3], sortie[1], sortie[3]):
-                if position_barre < max(entree[1], entree[3], sortie[1], sortie[3]):
-                    genere_labyrinthe(top_left, [down_right[0], position_barre], entree, porte, taille_case, image, trace = True)
-                    genere_labyrinthe([top_left[0], position_barre], down_right, porte, sortie, taille_case, image, trace = True)
-                else:
-                    genere_labyrinthe(top_left, [down_right[0], position_barre], entree, sortie, taille_case, image, trace = True)
-                    genere_labyrinthe([top_left[0], position_barre], down_right, [], [], taille_case, image)
-            else:
-                genere_labyrinthe(top_left, [down_right[0], position_barre], [], [], taille_case, image)
-                genere_labyrinthe([top_left[0], position_barre], down_right, entree, sortie, taille_case, image, trace = True)
-
-
-def recupere_entree_sortie(entree, sortie):
-    """ Fonction qui récupérer les paramètres pour tracer la solution. """
-    entree_sortie = set()
-    if entree[0] == entree[2]: # entree verticale
-        if sortie[0] == sortie[2]:
-            entree_sortie = {'droite', 'gauche'}
-        else: # sortie horizontale
-            if entree[0] < max(sortie[0], sortie[2]):
-                entree_sortie.add('gauche')
-            else:
-                entree_sortie.add('droite')
-            if sortie[1] < max(entree[1], entree[3]):
-                entree_sortie.add('haut')
-            else:
-                entree_sortie.add('bas')
-    else: # entree horizontale
-        if sortie[1] == sortie[3]:
-            entree_sortie = {'bas', 'haut'}
-        else: # sortie verticale
-            if entree[1] < max(sortie[1], sortie[3]):
-                entree_sortie.add('haut')
-            else:
-                entree_sortie.add('bas')
-            if sortie[0] < max(entree[0], entree[2]):
-                entree_sortie.add('gauche')
+    return (top_left, (down_right[0], position_barre)), ((top_left[0], position_barre), down_right)
+
+
+def genere_labyrinthe(grille, progression = None, alea = random):
+    """ Fonction qui construit le labyrinthe par divisions récursives successives.
+
+    Les murs sont ajoutés dans grille (voir grille_labyrinthe), qui ne doit
+    avoir au départ que ses murs extérieurs. Les tirages sont faits avec alea,
+    un random.Random pour un résultat reproductible, le module random par
+    défaut.
+
+    La récursion est simulée par une pile explicite de zones restant à
+    diviser : la profondeur de pile Python reste constante quelle que soit la
+    taille de la grille.
+
+    Si progression est donnée, elle est appelée avec le nombre de cases
+    terminées et le nombre total de cases, à chaque case terminée.
+    """
+
+    cases_totales = grille.largeur * grille.hauteur
+    cases_terminees = 0
+    # Chaque zone est un couple (haut_gauche, bas_droite) en cases
+    pile = [((0, 0), (grille.largeur, grille.hauteur))]
+
+    while pile:
+        sous_zones = divise_zone(grille, pile.pop(), alea)
+        if sous_zones is None:
+            cases_terminees += 1
+            if progression is not None:
+                progression(cases_terminees, cases_totales)
+            continue
+        # "Recursion" : la seconde zone est empilée d'abord pour être traitée après la première
+        pile.append(sous_zones[1])
+        pile.append(sous_zones[0])
+
+
+def genere_tuile(taches):
+    """ Génère le labyrinthe d'une tuile dans un processus de travail.
+
+    taches est un triplet (largeur, hauteur, graine). Renvoie les octets de
+    murs de la tuile, sans ses bords qui appartiennent aux tuiles voisines.
+    """
+    largeur, hauteur, graine = taches
+    tuile = Grille(largeur, hauteur, bytearray(largeur * hauteur))
+    genere_labyrinthe(tuile, alea=random.Random(graine))
+    return bytes(tuile.murs)
+
+
+def genere_labyrinthe_tuiles(grille, graine, niveaux = 4, processus = None, progression = None):
+    """ Version parallèle et reproductible de genere_labyrinthe.
+
+    Les niveaux premiers niveaux de division sont faits ici avec un
+    random.Random(graine), ce qui découpe la grille en au plus 2**niveaux
+    tuiles indépendantes. Chaque tuile est ensuite générée dans un
+    ProcessPoolExecutor à processus travailleurs (tous les cœurs par défaut,
+    1 pour tout faire dans ce processus), avec une graine dérivée de graine et
+    du numéro de la tuile, puis recopiée dans la grille.
+
+    Le découpage et les graines ne dépendent que de graine et de niveaux : le
+    labyrinthe obtenu est le même quel que soit le nombre de processus.
+    """
+    alea = random.Random(graine)
+    cases_totales = grille.largeur * grille.hauteur
+    cases_terminees = 0
+    zones = [((0, 0), (grille.largeur, grille.hauteur))]
+    for _ in range(niveaux):
+        zones_suivantes = []
+        for zone in zones:
+            sous_zones = divise_zone(grille, zone, alea)
+            if sous_zones is None:
+                cases_terminees += 1
             else:
-                entree_sortie.add('droite')
-    return entree_sortie
-
-def trace_solution(entree_sortie, haut_gauche, taille_case, image):
-    """ Fonction qui trace la solution dans le fichier. """
-    print(svg.genere_balise_debut_groupe('red', 'none', 3), file = image)
-    if 'haut' in entree_sortie:
-        print(svg.genere_segment(svg.Point(haut_gauche[0] + taille_case/2, haut_gauche[1]), \
-                svg.Point(haut_gauche[0] + taille_case/2, haut_gauche[1] + taille_case/2)), file = image)
-    if 'bas' in entree_sortie:
-        print(svg.genere_segment(svg.Point(haut_gauche[0] + taille_case/2, haut_gauche[1] + taille_case/2), \
-                svg.Point(haut_gauche[0] + taille_case/2, haut_gauche[1] + taille_case)), file = image)
-    if 'droite' in entree_sortie:
-        print(svg.genere_segment(svg.Point(haut_gauche[0] + taille_case/2, haut_gauche[1] + taille_case/2), \
-                svg.Point(haut_gauche[0] + taille_case, haut_gauche[1] + taille_case/2)), file = image)
-    if 'gauche' in entree_sortie:
-        print(svg.genere_segment(svg.Point(haut_gauche[0], haut_gauche[1] + taille_case/2), \
-                svg.Point(haut_gauche[0] + taille_case/2, haut_gauche[1] + taille_case/2)), file = image)
-    print(svg.genere_balise_fin_groupe(), file = image)
+                zones_suivantes.extend(sous_zones)
+        zones = zones_suivantes
 
+    taches = [(down_right[0] - top_left[0], down_right[1] - top_left[1], f"{graine}/{numero}")
+              for numero, (top_left, down_right) in enumerate(zones)]
+    with ProcessPoolExecutor(max_workers=processus) if processus != 1 else nullcontext() as executeur:
+        resultats = map(genere_tuile, taches) if executeur is None else executeur.map(genere_tuile, taches)
+        for (top_left, down_right), murs_tuile in zip(zones, resultats):
+            largeur_tuile = down_right[0] - top_left[0]
+            for ligne in range(down_right[1] - top_left[1]):
+                debut = (top_left[1] + ligne) * grille.largeur + top_left[0]
+                ligne_tuile = murs_tuile[ligne * largeur_tuile:(ligne + 1) * largeur_tuile]
+                # OU bit à bit de toute la ligne d'un coup, en passant par des entiers
+                grille.murs[debut:debut + largeur_tuile] = \
+                    (int.from_bytes(grille.murs[debut:debut + largeur_tuile], 'little')
+                     | int.from_bytes(ligne_tuile, 'little')).to_bytes(largeur_tuile, 'little')
+            cases_terminees += len(murs_tuile)
+            if progression is not None:
+                progression(cases_terminees, cases_totales)
 
-def main():
-    """ Fonction qui gère l'ouverture de l'image et l'appel à la fonction
-    de création du labyrinthe. """
-    # initialisation
-    image = open("labyrinthe.svg", 'w')
-    largeur = 800
-    hauteur = 600
-    taille_case = 10
-
-    print(svg.genere_balise_debut_image(largeur, hauteur), file = image)
-
-    # Font blanc
-    print(svg.genere_balise_debut_groupe('white', 'white', 0), file = image)
-    print(svg.genere_rectangle(svg.Point(0, 0), largeur, hauteur), file = image)
-    print(svg.genere_balise_fin_groupe(), file = image)
-
-    # Contour
-    print(svg.genere_balise_debut_groupe('black', None, 5), file = image)
-    print(svg.genere_rectangle(svg.Point(0, 0), largeur, hauteur), file = image)
-    print(svg.genere_balise_fin_groupe(), file = image)
-    print(svg.genere_balise_debut_groupe('white', 'white', 0), file = image)
-    print(svg.genere_rectangle(svg.Point(2.5, 0), 7.5, 10), file = image)
-    print(svg.genere_rectangle(svg.Point(hauteur - taille_case -2.5, largeur - taille_case), 10, 10), file = image)
-    print(svg.genere_balise_fin_groupe(), file = image)
-
-    # Labyrinthe
-    print(svg.genere_balise_debut_groupe('black', None, 3), file = image)
-    if len(sys.argv) > 1 and sys.argv[1] == 'True':
-        genere_labyrinthe([0, 0], [largeur, hauteur], [0, 0, 10, 0], [largeur-10, hauteur, largeur, hauteur], taille_case, image, trace = True)
+
+def runs_de_murs(cases, direction):
+    """ Renvoie les intervalles [debut, fin[ de cases consécutives ayant un mur dans la direction donnée.
+
+    cases est une suite d'octets de murs (une ligne ou une colonne de la
+    grille) ; la recherche est faite par une expression régulière sur les
+    octets traduits en 0/1, sans boucle Python par case.
+    """
+    traduits = bytes(cases).translate(TABLES_MURS[direction])
+    return [run.span() for run in RUN_DE_MURS.finditer(traduits)]
+
+
+def rendu_svg(grille, taille_case, image, solution = None):
+    """ Trace les murs de la grille, puis la solution si elle est donnée, dans un SvgWriter.
+
+    solution est un chemin de cases (x, y) allant de l'entrée à la sortie,
+    comme renvoyé par les solveurs de solveur_labyrinthe.
+    """
+    largeur, hauteur, murs = grille
+
+    image.debut_groupe('black', 'none', 3)
+    # Murs horizontaux : le haut de chaque ligne, puis le bas de la dernière
+    for y in range(hauteur + 1):
+        ligne = murs[y * largeur:(y + 1) * largeur] if y < hauteur else murs[(hauteur - 1) * largeur:]
+        direction = HAUT if y < hauteur else BAS
+        image.segments_coordonnees((debut * taille_case, y * taille_case, fin * taille_case, y * taille_case)
+                                   for debut, fin in runs_de_murs(ligne, direction))
+    # Murs verticaux : la gauche de chaque colonne, puis la droite de la dernière
+    for x in range(largeur + 1):
+        colonne = murs[x::largeur] if x < largeur else murs[largeur - 1::largeur]
+        direction = GAUCHE if x < largeur else DROITE
+        image.segments_coordonnees((x * taille_case, debut * taille_case, x * taille_case, fin * taille_case)
+                                   for debut, fin in runs_de_murs(colonne, direction))
+    image.fin_groupe()
+
+    if solution is not None:
+        image.debut_groupe('red', 'none', 3)
+        image.polyligne(points_solution(solution, taille_case))
+        image.fin_groupe()
+
+
+def points_solution(solution, taille_case):
+    """ Renvoie les sommets de la ligne brisée passant par le centre des cases de la solution.
+
+    Seuls les changements de direction sont gardés. La ligne part du bord haut
+    de la première case et finit au bord bas de la dernière, là où sont
+    l'entrée et la sortie.
+    """
+    premiere, derniere = solution[0], solution[-1]
+    centres = [(premiere[0], premiere[1] - 0.5)] + solution + [(derniere[0], derniere[1] + 0.5)]
+    def sens(depart, arrivee):
+        return ((arrivee[0] > depart[0]) - (arrivee[0] < depart[0]), (arrivee[1] > depart[1]) - (arrivee[1] < depart[1]))
+
+    sommets = [centres[0]]
+    for precedent, case, suivant in zip(centres, centres[1:], centres[2:]):
+        if sens(precedent, case) != sens(case, suivant):
+            sommets.append(case)
+    sommets.append(centres[-1])
+    return [((x + 0.5) * taille_case, (y + 0.5) * taille_case) for x, y in sommets]
+
+
+def rendu_texte(grille, fichier):
+    """ Écrit la grille en art ASCII, avec des +, des --- et des |. """
+    largeur, hauteur, murs = grille
+    for y in range(hauteur):
+        ligne = murs[y * largeur:(y + 1) * largeur]
+        fichier.write("+" + "".join("---+" if mur & HAUT else "   +" for mur in ligne) + "\n")
+        fichier.write("".join("|   " if mur & GAUCHE else "    " for mur in ligne)
+                      + ("|" if ligne[-1] & DROITE else " ") + "\n")
+    fichier.write("+" + "".join("---+" if mur & BAS else "   +" for mur in murs[(hauteur - 1) * largeur:]) + "\n")
+
+
+def rendu_pgm(grille, taille_case, fichier):
+    """ Écrit la grille en image PGM ASCII (P2) : murs noirs d'un pixel sur fond blanc. """
+    largeur, hauteur, murs = grille
+    largeur_image = largeur * taille_case + 1
+    fichier.write(f"P2\n{largeur_image} {hauteur * taille_case + 1}\n255\n")
+    for y in range(hauteur + 1):
+        # Ligne de pixels portant les murs horizontaux
+        pixels = ["255"] * largeur_image
+        ligne = murs[y * largeur:(y + 1) * largeur] if y < hauteur else murs[(hauteur - 1) * largeur:]
+        direction = HAUT if y < hauteur else BAS
+        for debut, fin in runs_de_murs(ligne, direction):
+            pixels[debut * taille_case:fin * taille_case + 1] = ["0"] * ((fin - debut) * taille_case + 1)
+        if y == hauteur:
+            fichier.write(" ".join(pixels) + "\n")
+            break
+        # Coins de cases
+        pixels[::taille_case] = ["0"] * (largeur + 1)
+        fichier.write(" ".join(pixels) + "\n")
+        # Lignes de pixels intérieures, avec les murs verticaux
+        pixels = ["255"] * largeur_image
+        for x, mur in enumerate(ligne):
+            if mur & GAUCHE:
+                pixels[x * taille_case] = "0"
+        if ligne[-1] & DROITE:
+            pixels[-1] = "0"
+        interieur = " ".join(pixels) + "\n"
+        fichier.write(interieur * (taille_case - 1))
+
+
+def affiche_progression(cases_terminees, cases_totales):
+    """ Affiche l'avancement de la génération sur la sortie d'erreur, par pas de 1%. """
+    if cases_terminees == cases_totales or cases_terminees % max(1, cases_totales // 100) == 0:
+        print(f"\r{100 * cases_terminees // cases_totales}%", end="\n" if cases_terminees == cases_totales else "",
+              file=sys.stderr, flush=True)
+
+
+# Un algorithme de génération est une fonction (grille, progression, alea)
+# et indique s'il part d'une grille pleine (creusement) ou vide (ajout de murs)
+Algorithme = namedtuple('Algorithme', 'genere grille_pleine')
+
+ALGORITHMES = {
+    "division": Algorithme(genere_labyrinthe, False),
+    "kruskal": Algorithme(genere_kruskal, True),
+    "wilson": Algorithme(genere_wilson, True),
+    "arbre_croissant": Algorithme(genere_arbre_croissant, True),
+}
+
+
+class CompteurOctets:
+    """ Faux fichier texte qui ne garde que le nombre de caractères écrits (pour --bench). """
+    def __init__(self):
+        self.octets = 0
+
+    def write(self, chaine):
+        """ Compte la chaîne au lieu de l'écrire. """
+        self.octets += len(chaine)
+        return len(chaine)
+
+
+def ecrit_labyrinthe(grille, solution, format_sortie, taille_case, fichier, fond):
+    """ Écrit la grille dans fichier au format donné.
+
+    fond est la chaîne SVG, préformatée une fois pour tout un lot, placée
+    sous les murs ; solution n'est tracée qu'en SVG.
+    """
+    if format_sortie == "texte":
+        rendu_texte(grille, fichier)
+    elif format_sortie == "pgm":
+        rendu_pgm(grille, taille_case, fichier)
+    else:
+        with svg.SvgWriter(fichier, grille.largeur * taille_case, grille.hauteur * taille_case, mode_chemin=True) as image:
+            image.write(fond)
+            rendu_svg(grille, taille_case, image, solution)
+
+
+def nom_sortie(arguments, numero, graine):
+    """ Renvoie la destination du labyrinthe numero du lot. """
+    extension = FORMATS[arguments.format]
+    if arguments.dossier is None and arguments.nombre == 1:
+        if arguments.format == "svg" or arguments.sortie not in ("labyrinthe.svg", svg.nom_compresse("labyrinthe.svg")):
+            return arguments.sortie
+        nom = "labyrinthe." + extension
     else:
-        genere_labyrinthe([0, 0], [largeur, hauteur], [0, 0, 10, 0], [largeur-10, hauteur, largeur, hauteur], taille_case, image)
-    print(svg.genere_balise_fin_groupe(), file = image)
+        nom = os.path.join(arguments.dossier or ".", f"labyrinthe_{numero if graine is None else graine}.{extension}")
+    if arguments.compression is not None:
+        nom = svg.nom_compresse(nom)
+    return nom
+
+
+def main():
+    """ Fonction qui gère la génération d'un lot de labyrinthes, leur écriture
+    et éventuellement la mesure de leur débit. """
+    analyseur = argparse.ArgumentParser(description="Génère des labyrinthes au format SVG, texte ou PGM.")
+    analyseur.add_argument("trace", nargs='?', default='False', help="True pour tracer la solution (SVG seulement)")
+    analyseur.add_argument("-n", "--nombre", type=int, default=1, help="nombre de labyrinthes à générer (défaut : 1)")
+    analyseur.add_argument("--largeur", type=int, default=80, help="largeur en cases (défaut : 80)")
+    analyseur.add_argument("--hauteur", type=int, default=60, help="hauteur en cases (défaut : 60)")
+    analyseur.add_argument("--taille-case", type=int, default=10, help="côté d'une case en pixels (défaut : 10)")
+    analyseur.add_argument("--algorithme", choices=ALGORITHMES, default="division",
+                           help="algorithme de génération (défaut : division)")
+    analyseur.add_argument("--solveur", choices=SOLVEURS, default="largeur",
+                           help="algorithme de recherche de la solution (défaut : largeur)")
+    analyseur.add_argument("--progression", action="store_true", help="affiche l'avancement sur la sortie d'erreur")
+    analyseur.add_argument("--format", choices=FORMATS, default="svg")
+    analyseur.add_argument("--graine", type=int,
+                           help="graine du premier labyrinthe, les suivants prennent les graines suivantes")
+    analyseur.add_argument("--tuiles", type=int, default=0, metavar="NIVEAUX",
+                           help="découpe en 2**NIVEAUX tuiles générées en parallèle (division, nécessite --graine)")
+    analyseur.add_argument("--processus", type=int, help="nombre de processus pour --tuiles (défaut : tous les cœurs)")
+    analyseur.add_argument("--dossier", help="dossier où écrire les labyrinthe_<graine>.<format> du lot")
+    analyseur.add_argument("--bench", action="store_true",
+                           help="n'écrit rien et affiche le débit en cases/s et en octets/s")
+    svg.ajoute_options_sortie(analyseur, "labyrinthe.svg")
+    arguments = analyseur.parse_args()
+    if arguments.tuiles and arguments.graine is None:
+        analyseur.error("--tuiles nécessite --graine")
+    if arguments.tuiles and arguments.algorithme != "division":
+        analyseur.error("--tuiles n'est possible qu'avec l'algorithme division")
+    algorithme = ALGORITHMES[arguments.algorithme]
+    if arguments.dossier is not None:
+        os.makedirs(arguments.dossier, exist_ok=True)
+
+    largeur, hauteur, taille_case = arguments.largeur, arguments.hauteur, arguments.taille_case
+    # Fond blanc, identique pour tout le lot
+    fond = svg.genere_balise_debut_groupe('white', 'white', 0) \
+        + svg.genere_rectangle(svg.Point(0, 0), largeur * taille_case, hauteur * taille_case) \
+        + svg.genere_balise_fin_groupe()
+    progression = affiche_progression if arguments.progression else None
+    temps_generation = temps_ecriture = 0
+    octets = 0
+
+    for numero in range(arguments.nombre):
+        graine = None if arguments.graine is None else arguments.graine + numero
+        debut = time.perf_counter()
+        grille = cree_grille(largeur, hauteur, algorithme.grille_pleine)
+        if arguments.tuiles:
+            genere_labyrinthe_tuiles(grille, graine, arguments.tuiles, arguments.processus, progression)
+        else:
+            algorithme.genere(grille, progression, random if graine is None else random.Random(graine))
+        ouvre_entree_sortie(grille)
+        solution = None
+        if arguments.trace == 'True':
+            solution = SOLVEURS[arguments.solveur](grille, (0, 0), (largeur - 1, hauteur - 1))
+        milieu = time.perf_counter()
+
+        if arguments.bench:
+            compteur = CompteurOctets()
+            ecrit_labyrinthe(grille, solution, arguments.format, taille_case, compteur, fond)
+            octets += compteur.octets
+        else:
+            with svg.ouvre_sortie(nom_sortie(arguments, numero, graine), arguments.compression) as fichier:
+                ecrit_labyrinthe(grille, solution, arguments.format, taille_case, fichier, fond)
+        temps_generation += milieu - debut
+        temps_ecriture += time.perf_counter() - milieu
+
+    if arguments.bench:
+        cases = arguments.nombre * largeur * hauteur
+        print(f"{arguments.nombre} labyrinthe(s) {arguments.algorithme} de {largeur}x{hauteur} cases, format {arguments.format}")
+        print(f"génération : {cases} cases en {temps_generation:.3f} s, {cases / temps_generation:.0f} cases/s")
+        print(f"écriture   : {octets} octets en {temps_ecriture:.3f} s, {octets / temps_ecriture:.0f} octets/s")
 
-    print(svg.genere_balise_fin_image(), file = image)
+# Formats de sortie et extension de fichier associée
+FORMATS = {"svg": "svg", "texte": "txt", "pgm": "pgm"}
 
 
 if __name__ == '__main__':
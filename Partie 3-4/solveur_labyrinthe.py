@@ -0,0 +1,119 @@
+"""
+Résolution d'un labyrinthe représenté par une grille (voir grille_labyrinthe).
+
+Les deux solveurs n'utilisent que des tableaux compacts indexés par numéro de
+case (y * largeur + x) : un bytearray qui retient pour chaque case visitée la
+direction par laquelle on y est arrivé, et qui sert aussi d'ensemble des cases
+visitées. Les indices de cases sont rangés dans des array('I') de 4 octets,
+ce qui suffit jusqu'à 2^32 cases.
+
+Le parcours en largeur coûte un octet par case en plus de la grille, plus 4
+octets par case des deux fronts qu'il garde, ce qui permet de traiter des
+labyrinthes de l'ordre de 10^8 cases. A* garde en plus le coût connu de
+chaque case (4 octets par case, soit 5 au total, 500 Mo pour 10^8 cases) et
+une file de priorité de tuples Python, d'une centaine d'octets par entrée,
+dont la taille dépend du labyrinthe (de l'ordre du pour cent des cases sur
+des labyrinthes de 700x700) : il explore moins de cases que le parcours en
+largeur mais coûte environ deux fois plus de mémoire.
+"""
+
+from array import array
+from heapq import heappush, heappop
+
+from grille_labyrinthe import HAUT, DROITE, BAS, GAUCHE, OPPOSES
+
+# Valeur du tableau des parents pour la case de départ (toute autre valeur non
+# nulle est la direction qui mène de la case à son parent)
+DEPART = 16
+
+
+def _voisins_accessibles(largeur, nb_cases, murs, indice):
+    """ Itère sur les couples (direction, indice voisin) sans mur entre les deux cases. """
+    mur = murs[indice]
+    if not mur & HAUT and indice >= largeur:
+        yield HAUT, indice - largeur
+    if not mur & BAS and indice + largeur < nb_cases:
+        yield BAS, indice + largeur
+    if not mur & GAUCHE and indice % largeur != 0:
+        yield GAUCHE, indice - 1
+    if not mur & DROITE and (indice + 1) % largeur != 0:
+        yield DROITE, indice + 1
+
+
+def _reconstruit_chemin(grille, parents, arrivee):
+    """ Remonte le tableau des parents depuis l'arrivée et renvoie le chemin de cases (x, y). """
+    decalages = {HAUT: -grille.largeur, BAS: grille.largeur, GAUCHE: -1, DROITE: 1}
+    chemin = []
+    indice = arrivee
+    while parents[indice] != DEPART:
+        chemin.append(indice)
+        indice += decalages[parents[indice]]
+    chemin.append(indice)
+    chemin.reverse()
+    return [(indice % grille.largeur, indice // grille.largeur) for indice in chemin]
+
+
+def resout_largeur(grille, depart, arrivee):
+    """ Renvoie le plus court chemin de cases (x, y) de depart à arrivee, ou None.
+
+    Parcours en largeur niveau par niveau : seuls les indices du front courant
+    et du suivant sont gardés, dans des array d'entiers de 4 octets. Temps
+    linéaire en nombre de cases.
+    """
+    largeur, hauteur, murs = grille
+    nb_cases = largeur * hauteur
+    parents = bytearray(nb_cases)
+    indice_depart = depart[1] * largeur + depart[0]
+    indice_arrivee = arrivee[1] * largeur + arrivee[0]
+    parents[indice_depart] = DEPART
+
+    front = array('I', [indice_depart])
+    while front and not parents[indice_arrivee]:
+        suivant = array('I')
+        for indice in front:
+            for direction, indice_voisin in _voisins_accessibles(largeur, nb_cases, murs, indice):
+                if not parents[indice_voisin]:
+                    parents[indice_voisin] = OPPOSES[direction]
+                    suivant.append(indice_voisin)
+        front = suivant
+
+    if not parents[indice_arrivee]:
+        return None
+    return _reconstruit_chemin(grille, parents, indice_arrivee)
+
+
+def resout_a_etoile(grille, depart, arrivee):
+    """ Renvoie le plus court chemin de cases (x, y) de depart à arrivee, ou None.
+
+    Algorithme A* guidé par la distance de Manhattan à l'arrivée. Les coûts
+    connus sont dans un array d'entiers de 4 octets par case, la file de
+    priorité contient des triplets (estimation, coût, indice), une centaine
+    d'octets chacun.
+    """
+    largeur, hauteur, murs = grille
+    nb_cases = largeur * hauteur
+    parents = bytearray(nb_cases)
+    couts = array('I', [0]) * nb_cases
+    indice_depart = depart[1] * largeur + depart[0]
+    indice_arrivee = arrivee[1] * largeur + arrivee[0]
+    parents[indice_depart] = DEPART
+
+    def estimation(indice):
+        return abs(indice % largeur - arrivee[0]) + abs(indice // largeur - arrivee[1])
+
+    file = [(estimation(indice_depart), 0, indice_depart)]
+    while file:
+        _, cout, indice = heappop(file)
+        if indice == indice_arrivee:
+            return _reconstruit_chemin(grille, parents, indice_arrivee)
+        if cout > couts[indice]:
+            continue # entrée périmée, la case a été atteinte plus court depuis
+        for direction, indice_voisin in _voisins_accessibles(largeur, nb_cases, murs, indice):
+            if not parents[indice_voisin] or cout + 1 < couts[indice_voisin]:
+                parents[indice_voisin] = OPPOSES[direction]
+                couts[indice_voisin] = cout + 1
+                heappush(file, (cout + 1 + estimation(indice_voisin), cout + 1, indice_voisin))
+    return None
+
+
+SOLVEURS = {"largeur": resout_largeur, "a_etoile": resout_a_etoile}